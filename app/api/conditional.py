@@ -0,0 +1,70 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response, status
+
+Version = Tuple[int, Optional[datetime]]
+
+
+def make_etag(versions: Iterable[Version], *extra: object) -> str:
+    """ETag forte derivado de `(id, updated_at)` de cada automóvel retornado."""
+    digest = hashlib.sha1()
+    for automovel_id, updated_at in versions:
+        digest.update(
+            f"{automovel_id}@{updated_at.isoformat() if updated_at else ''};".encode()
+        )
+    for value in extra:
+        if value is not None:
+            digest.update(f"|{value}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def last_modified(versions: Iterable[Version]) -> Optional[datetime]:
+    timestamps = [updated_at for _, updated_at in versions if updated_at]
+    return max(timestamps) if timestamps else None
+
+
+def cache_headers(etag: str, modified_at: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if modified_at:
+        headers["Last-Modified"] = format_datetime(
+            modified_at.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(
+    request: Request, etag: str, modified_at: Optional[datetime]
+) -> bool:
+    """
+    Avalia If-None-Match e If-Modified-Since (RFC 9110). Quando If-None-Match está
+    presente, If-Modified-Since é ignorado.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified_at:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # Last-Modified tem precisão de segundos.
+        return modified_at.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
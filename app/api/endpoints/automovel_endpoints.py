@@ -1,18 +1,78 @@
-from typing import List
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repository.connection import get_db_session
-from app.schemas.automovel_schemas import (AutomovelFilter, AutomovelInDataBase, AutomovelBase)
-from app.view.automovel_crud import AutomovelCRUD
+from app.api.conditional import (
+    cache_headers,
+    has_conditional_headers,
+    is_not_modified,
+    last_modified,
+    make_etag,
+    not_modified_response,
+)
+from app.api.export import MEDIA_TYPES, csv_chunks, ndjson_chunks
+from app.api.responses import ORJSONResponse
+from app.core.config import settings
+from app.repository.connection import (
+    get_db_session,
+    get_read_session,
+    pin_reads_to_primary,
+)
+from app.schemas.automovel_schemas import (
+    AUTOMOVEL_FIELDS,
+    AutomovelBase,
+    AutomovelBulkChange,
+    AutomovelBulkResult,
+    AutomovelFacets,
+    AutomovelFilter,
+    AutomovelInDataBase,
+    AutomovelInventoryVersion,
+    AutomovelPatch,
+    partial_automovel_model,
+)
+from app.view.automovel_crud import AutomovelCRUD, BulkLimitExceededError
+from app.view.pagination import SORTABLE_COLUMNS, InvalidCursorError, InvalidSortError
 
 router = APIRouter()
 
 
-# O Depends(get_db_session) injeta uma sessão de DB para cada requisição
+def parse_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a retornar, separados por vírgula (ex: id,marca,modelo,ano,placa).",
+    )
+) -> Optional[Tuple[str, ...]]:
+    if not fields:
+        return None
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in AUTOMOVEL_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos desconhecidos em fields: {', '.join(unknown)}. "
+            f"Campos válidos: {', '.join(AUTOMOVEL_FIELDS)}.",
+        )
+    return requested
+
+
+# O Depends(get_db_session) injeta uma sessão do primário para cada requisição; as rotas
+# de leitura usam get_read_session (réplica, quando configurada).
 @router.post(
-    "/", response_model=AutomovelInDataBase, status_code=status.HTTP_201_CREATED
+    "/",
+    response_model=AutomovelInDataBase,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(pin_reads_to_primary)],
 )
 async def create_automovel_endpoint(
     automovel: AutomovelBase, db_session: AsyncSession = Depends(get_db_session)
@@ -21,37 +81,287 @@ async def create_automovel_endpoint(
     return await crud.create_automovel(automovel)
 
 
-@router.get("/", response_model=List[AutomovelInDataBase], operation_id="get_automoveis")
-async def read_automoveis_endpoint(
+@router.post(
+    "/bulk",
+    response_model=AutomovelBulkResult,
+    dependencies=[Depends(pin_reads_to_primary)],
+)
+async def bulk_upsert_automoveis_endpoint(
+    automoveis: List[Dict[str, Any]] = Body(
+        ..., description="Lista de automóveis no formato de criação (AutomovelCreate)."
+    ),
+    batch_size: int = Query(
+        settings.BULK_BATCH_SIZE,
+        ge=1,
+        le=settings.BULK_MAX_BATCH_SIZE,
+        description="Quantidade de automóveis por INSERT multi-linha.",
+    ),
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Cria ou atualiza automóveis em lote, usando o chassi como chave.
+    Cada item é validado individualmente: itens inválidos são rejeitados
+    sem interromper o restante do lote, e a resposta traz o resultado por item.
+    """
+    crud = AutomovelCRUD(db_session)
+    return await crud.bulk_upsert_automoveis(automoveis, batch_size=batch_size)
+
+
+DRY_RUN_QUERY = Query(
+    True,
+    description="Padrão: só conta os automóveis atingidos. Envie `false` para executar.",
+)
+
+
+def _bulk_error(error: ValueError) -> HTTPException:
+    if isinstance(error, BulkLimitExceededError):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+
+
+@router.patch(
+    "/",
+    response_model=AutomovelBulkChange,
+    dependencies=[Depends(pin_reads_to_primary)],
+)
+async def bulk_patch_automoveis_endpoint(
+    patch: AutomovelPatch,
+    filters: AutomovelFilter = Depends(),
+    dry_run: bool = DRY_RUN_QUERY,
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Altera os campos enviados em todos os automóveis que atendem aos filtros,
+    com um único UPDATE no banco. Chassi e placa não podem ser alterados em lote,
+    e pelo menos um filtro é obrigatório (400).
+    Por padrão é um dry-run que só devolve a contagem; com `dry_run=false` a
+    alteração é feita, desde que não passe de BULK_MAX_AFFECTED automóveis (409).
+    Exemplo de uso:
+    - PATCH /automoveis/?marca=Fiat&ano_max=2010&dry_run=false  {"cor": "Prata"}
+    """
+    crud = AutomovelCRUD(db_session)
+    try:
+        return await crud.update_automoveis_by_filter(filters, patch, dry_run=dry_run)
+    except ValueError as e:
+        raise _bulk_error(e)
+
+
+@router.delete(
+    "/",
+    response_model=AutomovelBulkChange,
+    dependencies=[Depends(pin_reads_to_primary)],
+)
+async def bulk_delete_automoveis_endpoint(
     filters: AutomovelFilter = Depends(),
+    dry_run: bool = DRY_RUN_QUERY,
     db_session: AsyncSession = Depends(get_db_session),
 ):
     """
-    Retorna uma lista de automóveis, com a opção de aplicar filtros.
+    Remove, com um único DELETE no banco, os automóveis que atendem aos filtros.
+    Por padrão é um dry-run; o mesmo limite de BULK_MAX_AFFECTED se aplica, e
+    sem nenhum filtro o pedido é recusado (400).
+    Exemplo de uso:
+    - DELETE /automoveis/?marca=Lote&dry_run=false
+    """
+    crud = AutomovelCRUD(db_session)
+    try:
+        return await crud.delete_automoveis_by_filter(filters, dry_run=dry_run)
+    except ValueError as e:
+        raise _bulk_error(e)
+
+
+@router.get(
+    "/",
+    response_model=List[AutomovelInDataBase],
+    response_class=ORJSONResponse,
+    operation_id="get_automoveis",
+)
+async def read_automoveis_endpoint(
+    request: Request,
+    filters: AutomovelFilter = Depends(),
+    limit: int = Query(
+        settings.PAGINATION_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.PAGINATION_MAX_LIMIT,
+        description="Quantidade máxima de automóveis por página.",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor retornado no header X-Next-Cursor da página anterior."
+    ),
+    order_by: Optional[str] = Query(
+        None,
+        description="Ordenação por um ou mais campos separados por vírgula; prefixo `-` "
+        f"para descendente. Campos: {', '.join(SORTABLE_COLUMNS)}. O id é sempre o desempate.",
+    ),
+    fields: Optional[Tuple[str, ...]] = Depends(parse_fields),
+    db_session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Retorna uma lista paginada de automóveis, com a opção de aplicar filtros.
+    Quando houver mais resultados, o header `X-Next-Cursor` traz o cursor da próxima página.
     Exemplos de uso:
     - /automoveis/?marca=Toyota
     - /automoveis/?ano_min=2020&quilometragem_max=50000
     - /automoveis/?tipo_combustivel=Gasolina
+    - /automoveis/?limit=50&cursor=eyJpZCI6NTB9
+    - /automoveis/?fields=id,marca,modelo,ano,placa
+    - /automoveis/?order_by=-ano,quilometragem
+
+    Ordenações atendidas direto pelo índice (sem sort em memória): uma única chave
+    (`ano`, `quilometragem`, `created_at` ou `marca`), ascendente ou descendente, ou
+    nenhuma (ordem por `id`). Combinações de duas ou mais chaves são aceitas, mas o
+    banco precisa ordenar a partir da primeira chave.
+
+    Suporta GET condicional: o ETag da página é derivado de `(id, updated_at)` dos
+    automóveis retornados, e `If-None-Match`/`If-Modified-Since` resultam em 304.
     """
     crud = AutomovelCRUD(db_session)
-    return await crud.get_all_automoveis(filters=filters)
+    try:
+        if has_conditional_headers(request):
+            # Confere a versão da página lendo só (id, updated_at) antes de buscar as linhas.
+            versions, has_more = await crud.fetch_automoveis_versions(
+                filters=filters, limit=limit, cursor=cursor, order_by=order_by
+            )
+            etag = make_etag(versions, has_more, fields)
+            modified_at = last_modified(versions)
+            if is_not_modified(request, etag, modified_at):
+                return not_modified_response(cache_headers(etag, modified_at))
+
+        rows, next_cursor = await crud.fetch_automoveis_rows(
+            filters=filters,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            order_by=order_by,
+        )
+    except (InvalidCursorError, InvalidSortError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    versions = [(row["id"], row["updated_at"]) for row in rows]
+    headers = cache_headers(
+        make_etag(versions, next_cursor is not None, fields), last_modified(versions)
+    )
+    if fields:
+        rows = [{name: row[name] for name in fields} for row in rows]
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    # As linhas vêm direto do banco: devolver a Response pronta evita que o FastAPI
+    # revalide cada item contra o response_model (mantido apenas para a documentação).
+    return ORJSONResponse(rows, headers=headers)
+
+
+@router.get("/facets", response_model=AutomovelFacets, operation_id="get_automoveis_facets")
+async def read_automoveis_facets_endpoint(
+    filters: AutomovelFilter = Depends(),
+    ano_bucket: int = Query(
+        5, ge=1, le=50, description="Tamanho, em anos, de cada faixa da contagem por ano."
+    ),
+    db_session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Retorna contagens dos automóveis filtrados por marca, tipo de combustível,
+    número de portas e faixa de ano, além do total e da quilometragem mínima/máxima.
+    Exemplos de uso:
+    - /automoveis/facets?tipo_combustivel=Flex
+    - /automoveis/facets?ano_min=2015&ano_bucket=1
+    """
+    crud = AutomovelCRUD(db_session)
+    return await crud.get_facets(filters=filters, ano_bucket=ano_bucket)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_automoveis_endpoint(
+    filters: AutomovelFilter = Depends(),
+    format: Literal["ndjson", "csv"] = Query(
+        "ndjson", description="Formato da exportação: ndjson ou csv."
+    ),
+    db_session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Exporta todos os automóveis que atendem aos filtros, sem paginação.
+    As linhas são lidas por um cursor no servidor e enviadas em blocos,
+    então a memória da API não cresce com o tamanho do estoque.
+    Exemplos de uso:
+    - /automoveis/export?format=csv
+    - /automoveis/export?format=ndjson&tipo_combustivel=Flex
+    """
+    crud = AutomovelCRUD(db_session)
+    partitions = crud.stream_automoveis(
+        filters=filters, chunk_size=settings.EXPORT_CHUNK_SIZE
+    )
+    chunks = csv_chunks(partitions) if format == "csv" else ndjson_chunks(partitions)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="automoveis.{format}"'
+        },
+    )
+
+
+@router.get(
+    "/inventory-version",
+    response_model=AutomovelInventoryVersion,
+    operation_id="get_automoveis_inventory_version",
+)
+async def read_inventory_version_endpoint(
+    db_session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Retorna uma versão do estoque que muda a cada criação, alteração ou remoção.
+    Serve para clientes invalidarem caches próprios (ex: respostas do agente)
+    sem precisar baixar a listagem.
+    """
+    crud = AutomovelCRUD(db_session)
+    return await crud.get_inventory_version()
 
 
 @router.get("/{automovel_id}", response_model=AutomovelInDataBase)
 async def read_automovel_endpoint(
-    automovel_id: int, db_session: AsyncSession = Depends(get_db_session)
+    automovel_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(parse_fields),
+    db_session: AsyncSession = Depends(get_read_session),
 ):
     crud = AutomovelCRUD(db_session)
+    if has_conditional_headers(request):
+        version = await crud.get_automovel_version(automovel_id)
+        if version:
+            headers = cache_headers(make_etag([version], fields), version[1])
+            if is_not_modified(request, headers["ETag"], version[1]):
+                return not_modified_response(headers)
+
+    if fields:
+        row = await crud.fetch_automovel_row(automovel_id, fields=fields)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Automóvel não encontrado"
+            )
+        headers = cache_headers(
+            make_etag([(row["id"], row["updated_at"])], fields), row["updated_at"]
+        )
+        automovel = partial_automovel_model(fields).model_validate(row)
+        return Response(
+            automovel.model_dump_json(), media_type="application/json", headers=headers
+        )
+
     automovel = await crud.get_automovel_by_id(automovel_id)
     if not automovel:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Automóvel não encontrado"
         )
 
+    version = (automovel.id, automovel.updated_at)
+    response.headers.update(cache_headers(make_etag([version]), automovel.updated_at))
     return automovel
 
 
-@router.put("/{automovel_id}", response_model=AutomovelInDataBase)
+@router.put(
+    "/{automovel_id}",
+    response_model=AutomovelInDataBase,
+    dependencies=[Depends(pin_reads_to_primary)],
+)
 async def update_automovel_endpoint(
     automovel_id: int,
     automovel_update: AutomovelBase,
@@ -67,7 +377,32 @@ async def update_automovel_endpoint(
     return updated_automovel
 
 
-@router.delete("/{automovel_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.patch(
+    "/{automovel_id}",
+    response_model=AutomovelInDataBase,
+    dependencies=[Depends(pin_reads_to_primary)],
+)
+async def patch_automovel_endpoint(
+    automovel_id: int,
+    automovel_patch: AutomovelPatch,
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    """Altera só os campos enviados, em um único UPDATE ... RETURNING."""
+    crud = AutomovelCRUD(db_session)
+    updated_automovel = await crud.update_automovel(automovel_id, automovel_patch)
+    if not updated_automovel:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Automóvel não encontrado"
+        )
+
+    return updated_automovel
+
+
+@router.delete(
+    "/{automovel_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(pin_reads_to_primary)],
+)
 async def delete_automovel_endpoint(
     automovel_id: int, db_session: AsyncSession = Depends(get_db_session)
 ):
@@ -0,0 +1,89 @@
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Response, status
+from pydantic import BaseModel
+from sqlalchemy import text
+
+from app.core.cache import CacheStats, query_cache
+from app.core.metrics import (
+    CONTENT_TYPE,
+    DB_POOL_CONNECTIONS,
+    QUERY_CACHE_EVENTS,
+    QUERY_CACHE_SIZE,
+    registry,
+)
+from app.repository.connection import (
+    PoolStats,
+    engine,
+    has_read_replica,
+    pool_monitor,
+    read_pool_monitor,
+    replica_health,
+)
+
+router = APIRouter()
+
+
+def _collect_pool_and_cache() -> None:
+    monitors = [pool_monitor] + ([read_pool_monitor] if has_read_replica() else [])
+    for monitor in monitors:
+        stats = monitor.snapshot()
+        for state in ("size", "checked_in", "checked_out", "overflow"):
+            value = getattr(stats, state)
+            if value is not None:
+                DB_POOL_CONNECTIONS.set(value, pool=monitor.name, state=state)
+
+    cache = query_cache.stats()
+    for name in ("hits", "misses", "evictions", "expirations"):
+        QUERY_CACHE_EVENTS.set_total(getattr(cache, name), event=name)
+    QUERY_CACHE_SIZE.set(cache.size)
+
+
+registry.on_collect(_collect_pool_and_cache)
+
+
+class ReadinessStatus(BaseModel):
+    status: str
+    database: bool
+    pool: PoolStats
+    replica_available: Optional[bool] = None
+    read_pool: Optional[PoolStats] = None
+
+
+@router.get("/health/ready", response_model=ReadinessStatus)
+async def readiness_endpoint(response: Response):
+    """
+    Verifica se o banco primário responde e expõe o estado do pool de conexões.
+    A réplica não afeta o status, já que as leituras caem para o primário sem ela.
+    """
+    database_ok = True
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logging.error(f"Banco de dados indisponível. Erro={e}")
+        database_ok = False
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    readiness = ReadinessStatus(
+        status="ok" if database_ok else "unavailable",
+        database=database_ok,
+        pool=pool_monitor.snapshot(),
+    )
+    if has_read_replica():
+        readiness.replica_available = replica_health.available()
+        readiness.read_pool = read_pool_monitor.snapshot()
+    return readiness
+
+
+@router.get("/cache/stats", response_model=CacheStats)
+async def cache_stats_endpoint():
+    """Retorna acertos, falhas e remoções do cache de consultas de automóveis."""
+    return query_cache.stats()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Métricas da API no formato texto do Prometheus."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,54 @@
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List
+
+import orjson
+
+from app.repository.models.automovel import Automovel
+
+EXPORT_COLUMNS = [column.name for column in Automovel.__table__.columns]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        # ISO 8601 com "T", como no JSON das outras rotas (orjson).
+        return value.isoformat()
+    return value
+
+
+async def ndjson_chunks(
+    partitions: AsyncIterator[List[Dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    """
+    Converte cada bloco de linhas em um único pedaço de NDJSON (uma linha JSON por
+    automóvel), com o orjson: enums e datas saem no mesmo formato de GET /automoveis/.
+    """
+    async for rows in partitions:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+async def csv_chunks(
+    partitions: AsyncIterator[List[Dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    """Converte cada bloco de linhas em um pedaço de CSV; o cabeçalho vai no primeiro pedaço."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for rows in partitions:
+        writer.writerows(
+            {key: _plain(value) for key, value in row.items()} for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
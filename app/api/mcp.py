@@ -0,0 +1,30 @@
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.types import HTTPRequestInfo
+from mcp import types
+
+from app.core.metrics import MCP_TOOL_CALLS
+
+
+class InstrumentedFastApiMCP(FastApiMCP):
+    """FastApiMCP que conta as chamadas de ferramentas em `mcp_tool_calls_total`."""
+
+    async def _execute_api_tool(
+        self,
+        client: httpx.AsyncClient,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        operation_map: Dict[str, Dict[str, Any]],
+        http_request_info: Optional[HTTPRequestInfo] = None,
+    ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+        outcome = "error"
+        try:
+            result = await super()._execute_api_tool(
+                client, tool_name, arguments, operation_map, http_request_info
+            )
+            outcome = "ok"
+            return result
+        finally:
+            MCP_TOOL_CALLS.inc(tool=tool_name, outcome=outcome)
@@ -0,0 +1,29 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.core.instrumentation import track_serialization
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Resposta JSON serializada com orjson. Usada quando o endpoint já devolve dados
+    confiáveis do banco (dicionários de colunas), evitando a revalidação pelo
+    response_model e a serialização do json da biblioteca padrão.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with track_serialization():
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    JSONResponse padrão da aplicação: mesma serialização do FastAPI, com o tempo de
+    render contado no `ser` do Server-Timing (rotas que não usam ORJSONResponse).
+    """
+
+    def render(self, content: Any) -> bytes:
+        with track_serialization():
+            return super().render(content)
@@ -0,0 +1,83 @@
+"""
+Tradução dos eventos do AgentExecutor (`astream_events`, v2) em `AgentEvent`s para o CLI,
+com o cache de respostas consultado antes de rodar o LLM.
+
+Não importa o langchain: o executor e o cliente da API são recebidos como parâmetros,
+o que permite testar o fluxo com um executor falso.
+"""
+
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+from app.cli.answer_cache import AnswerCache
+from app.cli.automovel_client import AutomovelAPIClient
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class AgentEvent(NamedTuple):
+    """
+    Evento do stream de uma resposta do agente:
+    - `token`: pedaço do texto gerado pelo LLM (pensamento, ação ou resposta final);
+    - `tool_start` / `tool_end`: chamada de ferramenta (`name`) com a entrada/saída em `text`;
+    - `answer`: a resposta final completa (`cached` se veio do cache de respostas).
+    """
+
+    kind: str
+    text: str
+    name: Optional[str] = None
+    cached: bool = False
+
+
+def _chunk_text(chunk: Any) -> str:
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, list):  # o Gemini pode devolver partes em vez de uma string
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return content or ""
+
+
+async def stream_agent_events(
+    executor: Any,
+    input_text: str,
+    api_client: AutomovelAPIClient,
+    answer_cache: Optional[AnswerCache] = None,
+) -> AsyncIterator[AgentEvent]:
+    """Roda `executor` emitindo tokens e chamadas de ferramenta à medida que acontecem."""
+    # Cada pergunta é independente (o agente não guarda histórico), então a mesma
+    # pergunta sobre o mesmo estoque pode reaproveitar a resposta sem chamar o LLM.
+    # `is not None`: um AnswerCache vazio tem len() == 0 e seria falso.
+    inventory_version = (
+        await api_client.get_inventory_version() if answer_cache is not None else None
+    )
+    if inventory_version is not None:
+        cached = answer_cache.get(input_text, inventory_version)
+        if cached is not None:
+            yield AgentEvent("answer", cached, cached=True)
+            return
+
+    output = None
+    async for event in executor.astream_events({"input": input_text}, version="v2"):
+        kind = event["event"]
+        if kind == "on_chat_model_stream":
+            text = _chunk_text(event["data"]["chunk"])
+            if text:
+                yield AgentEvent("token", text)
+        elif kind == "on_tool_start":
+            yield AgentEvent(
+                "tool_start", str(event["data"].get("input", "")), event["name"]
+            )
+        elif kind == "on_tool_end":
+            yield AgentEvent(
+                "tool_end", str(event["data"].get("output", "")), event["name"]
+            )
+        elif kind == "on_chain_end" and not event["parent_ids"]:
+            # Fim do próprio AgentExecutor (o único evento sem pai).
+            output = event["data"]["output"]["output"]
+
+    if output is None:
+        raise RuntimeError("O agente terminou sem produzir uma resposta.")
+    if inventory_version is not None:
+        answer_cache.set(input_text, inventory_version, output)
+    yield AgentEvent("answer", output)
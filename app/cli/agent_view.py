@@ -0,0 +1,65 @@
+"""
+Estado exibido pelo CLI durante uma resposta do agente, montado a partir dos
+`AgentEvent`s. Fica fora de cli.py para poder ser usado sem carregar o langchain.
+"""
+
+from typing import Optional
+
+from rich.console import Group
+from rich.panel import Panel
+from rich.text import Text
+
+from app.cli.agent_stream import FINAL_ANSWER_MARKER, AgentEvent
+
+TOOL_OUTPUT_PREVIEW = 120
+
+
+class AgentTurnView:
+    """Estado exibido no Live durante uma resposta: passos intermediários e a resposta parcial."""
+
+    def __init__(self):
+        self.steps = Text(style="dim")
+        self.generation = ""  # texto da chamada atual ao LLM
+        self.answer: Optional[str] = None
+
+    def apply(self, event: AgentEvent) -> None:
+        if event.kind == "token":
+            self.generation += event.text
+        elif event.kind == "tool_start":
+            self._flush_generation()
+            self.steps.append(f"→ {event.name}: {event.text}\n", style="cyan")
+        elif event.kind == "tool_end":
+            preview = event.text.splitlines()[0] if event.text else ""
+            if len(preview) > TOOL_OUTPUT_PREVIEW:
+                preview = preview[:TOOL_OUTPUT_PREVIEW] + "…"
+            self.steps.append(f"← {preview}\n")
+        elif event.kind == "answer":
+            self.answer = event.text
+
+    def _flush_generation(self) -> None:
+        thought = self.generation.strip()
+        if thought:
+            self.steps.append(thought + "\n")
+        self.generation = ""
+
+    def partial_answer(self) -> str:
+        _, marker, answer = self.generation.partition(FINAL_ANSWER_MARKER)
+        return answer.lstrip() if marker else ""
+
+    def __rich__(self):
+        thinking = self.generation.partition(FINAL_ANSWER_MARKER)[0].strip()
+        parts = [self.steps]
+        if thinking:
+            parts.append(Text(thinking, style="dim italic"))
+        answer = self.partial_answer()
+        parts.append(
+            Panel(
+                (
+                    Text(answer, style="green")
+                    if answer
+                    else Text("O agente está pensando...", style="italic blue")
+                ),
+                title="[bold green]Agente Automóveis[/bold green]",
+            )
+        )
+        return Group(*parts)
@@ -0,0 +1,116 @@
+"""
+Cache em disco (SQLite) das respostas do agente, consultado antes de rodar o LLM.
+
+A chave é a pergunta normalizada (sem diferença de caixa, acentos e espaços) mais a
+versão do estoque da API (GET /automoveis/inventory-version): qualquer criação,
+alteração ou remoção de automóvel muda a versão e invalida todas as respostas antigas.
+As entradas expiram por TTL e o arquivo é limitado às `maxsize` mais usadas (LRU).
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    inventory_version TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+)
+"""
+
+
+def normalize_question(question: str) -> str:
+    """Ex: '  Quais carros ELÉTRICOS vocês têm? ' -> 'quais carros eletricos voces tem'."""
+    text = unicodedata.normalize("NFKD", question)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"\s+", " ", text.casefold()).strip()
+    return text.rstrip("?!. ")
+
+
+class AnswerCache:
+    def __init__(self, path: str, ttl: float = 3600.0, maxsize: int = 500):
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_answers_last_used_at ON answers (last_used_at)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["AnswerCache"]:
+        """Configurado por AGENT_ANSWER_CACHE_*; um caminho vazio desliga o cache."""
+        path = os.getenv("AGENT_ANSWER_CACHE_PATH", ".agent_answer_cache.sqlite3")
+        if not path:
+            return None
+        return cls(
+            path,
+            ttl=float(os.getenv("AGENT_ANSWER_CACHE_TTL", "3600")),
+            maxsize=int(os.getenv("AGENT_ANSWER_CACHE_MAXSIZE", "500")),
+        )
+
+    @staticmethod
+    def make_key(question: str, inventory_version: str) -> str:
+        payload = f"{inventory_version}\0{normalize_question(question)}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, question: str, inventory_version: str) -> Optional[str]:
+        key = self.make_key(question, inventory_version)
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT answer, created_at FROM answers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] + self.ttl < now:
+            self.misses += 1
+            return None
+
+        self._conn.execute(
+            "UPDATE answers SET last_used_at = ? WHERE key = ?", (now, key)
+        )
+        self._conn.commit()
+        self.hits += 1
+        return row[0]
+
+    def set(self, question: str, inventory_version: str, answer: str) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.make_key(question, inventory_version),
+                    inventory_version,
+                    normalize_question(question),
+                    answer,
+                    now,
+                    now,
+                ),
+            )
+            # Respostas de outra versão do estoque nunca mais seriam encontradas.
+            self._conn.execute(
+                "DELETE FROM answers WHERE inventory_version != ? OR created_at < ?",
+                (inventory_version, now - self.ttl),
+            )
+            self._conn.execute(
+                "DELETE FROM answers WHERE key NOT IN "
+                "(SELECT key FROM answers ORDER BY last_used_at DESC LIMIT ?)",
+                (self.maxsize,),
+            )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT count(*) FROM answers").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,310 @@
+"""
+Acesso do agente ao estoque de automóveis, com três transportes intercambiáveis:
+
+- `inprocess`: chama o AutomovelCRUD direto, com uma sessão do pool da própria aplicação;
+- `asgi`: chama `app.main:app` pelo httpx.ASGITransport, sem socket;
+- `http`: a API remota, com keep-alive, limite de conexões e timeouts configurados.
+
+O modo vem de `AGENT_API_MODE` (padrão `http`). Os dois primeiros só servem quando o
+agente roda no mesmo processo/implantação da API e importam a aplicação sob demanda,
+para o modo `http` continuar funcionando sem as variáveis do banco.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+import httpx
+from pydantic import BaseModel, ValidationError, computed_field
+
+AGENT_API_MODES = ("inprocess", "asgi", "http")
+DEFAULT_API_URL = "http://127.0.0.1:8000"
+# Mesmo tamanho de página padrão de GET /automoveis/.
+RESULT_LIMIT = 100
+SHOWN_RESULTS = 5
+
+
+class AutomovelPage(NamedTuple):
+    rows: List[Dict[str, Any]]
+    has_more: bool  # há resultados além de `limit` (a listagem devolveu um cursor)
+
+
+class AutomovelBackend(Protocol):
+    """Busca uma página de automóveis (como dicts) a partir dos filtros da listagem."""
+
+    async def fetch(self, params: Mapping[str, Any], limit: int) -> AutomovelPage: ...
+
+    async def inventory_version(self) -> str: ...
+
+    async def aclose(self) -> None: ...
+
+
+class InProcessBackend:
+    """Sem serialização nem HTTP: o mesmo caminho do endpoint, chamado como função."""
+
+    def __init__(self, session_factory=None):
+        from app.repository.connection import AsyncReadSessionLocal
+
+        self.session_factory = session_factory or AsyncReadSessionLocal
+
+    async def fetch(self, params: Mapping[str, Any], limit: int) -> AutomovelPage:
+        from app.schemas.automovel_schemas import AutomovelFilter
+        from app.view.automovel_crud import AutomovelCRUD
+
+        filters = AutomovelFilter(**params)
+        async with self.session_factory() as session:
+            rows, next_cursor = await AutomovelCRUD(session).fetch_automoveis_rows(
+                filters=filters, limit=limit
+            )
+        return AutomovelPage(rows, next_cursor is not None)
+
+    async def inventory_version(self) -> str:
+        from app.view.automovel_crud import AutomovelCRUD
+
+        async with self.session_factory() as session:
+            return (await AutomovelCRUD(session).get_inventory_version()).version
+
+    async def aclose(self) -> None:
+        pass
+
+
+class HTTPXBackend:
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def fetch(self, params: Mapping[str, Any], limit: int) -> AutomovelPage:
+        response = await self.client.get(
+            "/automoveis/", params={**params, "limit": limit}
+        )
+        response.raise_for_status()
+        return AutomovelPage(response.json(), "X-Next-Cursor" in response.headers)
+
+    async def inventory_version(self) -> str:
+        response = await self.client.get("/automoveis/inventory-version")
+        response.raise_for_status()
+        return response.json()["version"]
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class ASGIBackend(HTTPXBackend):
+    def __init__(self, app=None):
+        if app is None:
+            from app.main import app
+        super().__init__(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://agent"
+            )
+        )
+
+
+class HTTPBackend(HTTPXBackend):
+    def __init__(
+        self,
+        base_url: str = DEFAULT_API_URL,
+        max_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        connect_timeout: float = 2.0,
+    ):
+        super().__init__(
+            httpx.AsyncClient(
+                base_url=base_url,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            )
+        )
+
+
+def create_backend(mode: Optional[str] = None) -> AutomovelBackend:
+    mode = (mode or os.getenv("AGENT_API_MODE", "http")).lower()
+    if mode == "inprocess":
+        return InProcessBackend()
+    if mode == "asgi":
+        return ASGIBackend()
+    if mode == "http":
+        return HTTPBackend(
+            base_url=os.getenv("AGENT_API_URL", DEFAULT_API_URL),
+            max_connections=int(os.getenv("AGENT_HTTP_MAX_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("AGENT_HTTP_KEEPALIVE_SECONDS", "30")),
+            timeout=float(os.getenv("AGENT_HTTP_TIMEOUT", "10")),
+        )
+    raise ValueError(
+        f"AGENT_API_MODE inválido: {mode!r}. Use um de: {', '.join(AGENT_API_MODES)}."
+    )
+
+
+def _plain(value: Any) -> Any:
+    # No modo inprocess o combustível vem como TipoCombustivel, não como string.
+    return getattr(value, "value", value)
+
+
+def format_automoveis(automoveis: List[Dict[str, Any]], has_more: bool = False) -> str:
+    """
+    Mostra os SHOWN_RESULTS primeiros. Com `has_more` a página veio cheia e há outras
+    depois dela, então o restante é só um limite inferior ("mais de N").
+    """
+    if not automoveis:
+        return "Nenhum automóvel encontrado com os filtros fornecidos."
+
+    formatted_results = []
+    for auto in automoveis[:SHOWN_RESULTS]:
+        formatted_results.append(
+            f"ID: {auto['id']}, Marca: {auto['marca']}, Modelo: {auto['modelo']}, "
+            f"Ano: {auto['ano']}, Cor: {auto['cor']}, Combustível: {_plain(auto['tipo_combustivel'])}, "
+            f"KM: {auto['quilometragem']}, Portas: {auto['numero_portas']}, Placa: {auto['placa'] or 'N/A'}, "
+            f"Chassi: {auto['chassi']}, FIPE: {auto['codigo_fipe']}"
+        )
+    hidden = len(automoveis) - SHOWN_RESULTS
+    if has_more:
+        summary = f"\n...e mais de {max(hidden, 0)} resultados."
+    elif hidden > 0:
+        summary = f"\n...e mais {hidden} resultados."
+    else:
+        summary = ""
+    return "Resultados encontrados:\n" + "\n".join(formatted_results) + summary
+
+
+def canonical_filters(filters: Mapping[str, Any]) -> str:
+    """Mesma chave para os mesmos filtros, independente da ordem e dos campos nulos."""
+    return json.dumps(
+        {name: value for name, value in filters.items() if value is not None},
+        sort_keys=True,
+        default=str,
+    )
+
+
+class ToolCacheStats(BaseModel):
+    lookups: int = 0
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    size: int = 0
+
+    @computed_field
+    @property
+    def saved(self) -> int:
+        """Consultas pedidas pelo agente que não chegaram à API."""
+        return self.hits + self.coalesced
+
+
+class AutomovelAPIClient:
+    """
+    Cliente usado pelas ferramentas do agente. Os resultados ficam em cache por
+    `cache_ttl` segundos (AGENT_TOOL_CACHE_TTL; 0 desliga), e chamadas simultâneas
+    com os mesmos filtros esperam a mesma consulta em vez de repeti-la.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[AutomovelBackend] = None,
+        cache_ttl: Optional[float] = None,
+        cache_maxsize: int = 256,
+    ):
+        self.backend = backend or create_backend()
+        if cache_ttl is None:
+            cache_ttl = float(os.getenv("AGENT_TOOL_CACHE_TTL", "30"))
+        self.cache_ttl = cache_ttl
+        self.cache_maxsize = cache_maxsize
+        self._results: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[str, "asyncio.Future[Tuple[str, bool]]"] = {}
+        self._stats = ToolCacheStats()
+
+    async def get_automoveis(self, filters: Mapping[str, Any]) -> str:
+        if self.cache_ttl <= 0:
+            return (await self._lookup(filters))[0]
+
+        self._stats.lookups += 1
+        key = canonical_filters(filters)
+        entry = self._results.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._results.move_to_end(key)
+            self._stats.hits += 1
+            return entry[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._stats.coalesced += 1
+            return (await asyncio.shield(in_flight))[0]
+
+        self._stats.misses += 1
+        lookup = asyncio.ensure_future(self._lookup(filters))
+        self._in_flight[key] = lookup
+        try:
+            # shield: cancelar quem iniciou a consulta não a cancela para quem está esperando.
+            result, ok = await asyncio.shield(lookup)
+        finally:
+            self._in_flight.pop(key, None)
+
+        if ok:  # erros não são guardados: a próxima chamada tenta de novo
+            self._results[key] = (time.monotonic() + self.cache_ttl, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.cache_maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    async def _lookup(self, filters: Mapping[str, Any]) -> Tuple[str, bool]:
+        try:
+            page = await self.backend.fetch(filters, RESULT_LIMIT)
+            return format_automoveis(page.rows, page.has_more), True
+        except httpx.RequestError as exc:
+            return (
+                f"Ocorreu um erro de rede ao tentar acessar a API: {exc.request.url!r} - {exc}",
+                False,
+            )
+        except httpx.HTTPStatusError as exc:
+            return (
+                f"Erro na resposta da API {exc.response.status_code}: {exc.response.text}",
+                False,
+            )
+        except ValidationError as exc:
+            return f"Filtros inválidos: {exc}", False
+        except Exception as e:
+            return f"Erro inesperado ao consultar automóveis: {e}", False
+
+    def cache_stats(self) -> ToolCacheStats:
+        return self._stats.model_copy(update={"size": len(self._results)})
+
+    async def get_inventory_version(self) -> Optional[str]:
+        """Versão atual do estoque, ou None se a API não responder (o chamador segue sem cache)."""
+        try:
+            return await self.backend.inventory_version()
+        except Exception:
+            return None
+
+    async def get_automoveis_batch(
+        self, filter_sets: Sequence[Mapping[str, Any]], concurrency: int = 4
+    ) -> List[str]:
+        """
+        Executa várias consultas ao mesmo tempo, no máximo `concurrency` por vez.
+        Como get_automoveis devolve os erros como texto, uma consulta que falha
+        não cancela as demais; a ordem da resposta é a da entrada.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(filters: Mapping[str, Any]) -> str:
+            async with semaphore:
+                return await self.get_automoveis(filters)
+
+        return list(await asyncio.gather(*(run(filters) for filters in filter_sets)))
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
@@ -1,6 +1,8 @@
 import asyncio
 import os
 import sys
+import time
+from typing import Optional
 
 from rich.console import Console
 from rich.live import Live
@@ -9,12 +11,46 @@ from rich.text import Text
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app.cli.llm_agent import run_agent
-
+from app.cli.agent_view import AgentTurnView
+from app.cli.llm_agent import api_client, stream_agent
 
 console = Console()
 
 
+async def answer_turn(user_input: str) -> None:
+    """Mostra a resposta conforme é gerada e, ao final, o tempo até o primeiro token e o total."""
+    view = AgentTurnView()
+    started = time.perf_counter()
+    first_token_at: Optional[float] = None
+    cached = False
+
+    # transient: o Live some ao final e a resposta é impressa uma única vez, completa.
+    with Live(
+        view, console=console, screen=False, refresh_per_second=12, transient=True
+    ) as live:
+        async for event in stream_agent(user_input):
+            if first_token_at is None and event.kind in ("token", "answer"):
+                first_token_at = time.perf_counter()
+            cached = cached or event.cached
+            view.apply(event)
+            live.refresh()
+    total = time.perf_counter() - started
+
+    if view.steps.plain:
+        console.print(view.steps)
+    console.print(
+        Panel(
+            Text(view.answer or "", style="green"),
+            title="[bold green]Agente Automóveis[/bold green]",
+        )
+    )
+    first_token = (first_token_at or started) - started
+    console.print(
+        f"[dim]Primeiro token em {first_token:.2f}s · total {total:.2f}s"
+        f"{' · resposta do cache' if cached else ''}[/dim]"
+    )
+
+
 async def main_cli():
     console.print(
         Panel(
@@ -28,26 +64,17 @@ async def main_cli():
     while True:
         user_input = console.input("[bold blue]Você: [/bold blue]")
         if user_input.lower() == "sair":
+            stats = api_client.cache_stats()
+            console.print(
+                f"[dim]Consultas de ferramenta: {stats.lookups}, evitadas pelo cache: "
+                f"{stats.saved} ({stats.hits} em cache, {stats.coalesced} agrupadas).[/dim]"
+            )
             console.print(
                 Panel("[bold yellow]Até logo![/bold yellow]", border_style="yellow")
             )
             break
 
-        with Live(
-            Text("O agente está pensando...", style="italic blue"),
-            console=console,
-            screen=False,
-            refresh_per_second=4,
-        ) as live:
-            agent_response = await run_agent(user_input)
-            live.stop()
-
-        console.print(
-            Panel(
-                Text(agent_response, style="green"),
-                title="[bold green]Agente Automóveis[/bold green]",
-            )
-        )
+        await answer_turn(user_input)
         console.print("")
 
 
@@ -1,13 +1,17 @@
+import json
 import os
-import httpx
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+from dotenv import load_dotenv
 from langchain.agents import AgentExecutor, create_react_agent
-from langchain_core.tools import Tool
 from langchain_core.prompts import PromptTemplate
 from langchain_core.pydantic_v1 import BaseModel, Field
-from typing import Optional, List, Dict, Any
-import asyncio
-from dotenv import load_dotenv
+from langchain_core.tools import Tool
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from app.cli.agent_stream import AgentEvent, stream_agent_events
+from app.cli.answer_cache import AnswerCache
+from app.cli.automovel_client import AutomovelAPIClient
 
 load_dotenv()
 
@@ -35,69 +39,105 @@ class AutomovelFilterToolSchema(BaseModel):
     )
     codigo_fipe: Optional[str] = Field(None, description="Código FIPE do automóvel.")
 
+    class Config:
+        # Um campo desconhecido volta como erro para o agente, em vez de ser ignorado.
+        extra = "forbid"
+
+
+BATCH_MAX_QUERIES = int(os.getenv("AGENT_BATCH_MAX_QUERIES", "10"))
+BATCH_CONCURRENCY = int(os.getenv("AGENT_BATCH_CONCURRENCY", "4"))
+
+INVALID_INPUT_HINT = (
+    'Envie um objeto JSON com os filtros, por exemplo: {"marca": "Toyota", "ano_min": 2020}.'
+)
+
+
+def _load_json(tool_input: Union[str, Dict[str, Any], List[Any]]) -> Any:
+    """Lê o Action Input do agente, que às vezes vem cercado por crases de bloco de código."""
+    if not isinstance(tool_input, str):
+        return tool_input
+    text = tool_input.strip().strip("`").strip()
+    if text.startswith("json"):
+        text = text[len("json"):]
+    return json.loads(text or "{}")
+
 
-class AutomovelAPIClient:
-    def __init__(self, base_url: str = "http://127.0.0.1:8000"):
-        self.base_url = base_url
-        self.client = httpx.AsyncClient()
-
-    async def get_automoveis(self, filters: AutomovelFilterToolSchema) -> str:
-        params = eval(filters) if isinstance(filters, str) else filters
-        # params = filters.model_dump(exclude_none=True)
-        try:
-            response = await self.client.get(
-                f"{self.base_url}/automoveis/", params=params
-            )
-            response.raise_for_status()
-            automoveis = response.json()
-            if automoveis:
-                formatted_results = []
-                for auto in automoveis[:5]:
-                    formatted_results.append(
-                        f"ID: {auto['id']}, Marca: {auto['marca']}, Modelo: {auto['modelo']}, "
-                        f"Ano: {auto['ano']}, Cor: {auto['cor']}, Combustível: {auto['tipo_combustivel']}, "
-                        f"KM: {auto['quilometragem']}, Portas: {auto['numero_portas']}, Placa: {auto['placa'] or 'N/A'}, "
-                        f"Chassi: {auto['chassi']}, FIPE: {auto['codigo_fipe']}"
-                    )
-                return (
-                    "Resultados encontrados:\n"
-                    + "\n".join(formatted_results)
-                    + (
-                        f"\n...e mais {len(automoveis) - 5} resultados."
-                        if len(automoveis) > 5
-                        else ""
-                    )
-                )
-            else:
-                return "Nenhum automóvel encontrado com os filtros fornecidos."
-        except httpx.RequestError as exc:
-            return f"Ocorreu um erro de rede ao tentar acessar a API: {exc.request.url!r} - {exc}"
-        except httpx.HTTPStatusError as exc:
-            return f"Erro na resposta da API {exc.response.status_code}: {exc.response.text}"
-        except Exception as e:
-            return f"Erro inesperado ao consultar automóveis: {e}"
+def parse_filters(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        raise ValueError("cada conjunto de filtros deve ser um objeto JSON")
+    return AutomovelFilterToolSchema.parse_obj(data).dict(exclude_none=True)
 
 
+# O transporte (inprocess, asgi ou http) vem de AGENT_API_MODE; veja app/cli/automovel_client.py.
 api_client = AutomovelAPIClient()
 
+
+async def consultar_automoveis(tool_input: Union[str, Dict[str, Any]]) -> str:
+    try:
+        filters = parse_filters(_load_json(tool_input))
+    except ValueError as e:
+        # JSONDecodeError e ValidationError são ValueError: o agente recebe o erro e corrige a entrada.
+        return f"Entrada inválida para a ferramenta: {e}. {INVALID_INPUT_HINT}"
+    return await api_client.get_automoveis(filters)
+
+
+async def consultar_automoveis_em_lote(tool_input: Union[str, List[Any]]) -> str:
+    try:
+        data = _load_json(tool_input)
+        if isinstance(data, dict):
+            data = data.get("consultas")
+        if not isinstance(data, list) or not data:
+            raise ValueError("a entrada deve ser uma lista de objetos de filtros")
+        if len(data) > BATCH_MAX_QUERIES:
+            raise ValueError(f"no máximo {BATCH_MAX_QUERIES} consultas por chamada")
+        filter_sets = [parse_filters(item) for item in data]
+    except ValueError as e:
+        return (
+            f"Entrada inválida para a ferramenta: {e}. Envie uma lista JSON, por exemplo: "
+            '[{"marca": "Toyota", "tipo_combustivel": "Flex"}, {"marca": "Honda"}].'
+        )
+
+    results = await api_client.get_automoveis_batch(
+        filter_sets, concurrency=BATCH_CONCURRENCY
+    )
+    return "\n\n".join(
+        f"Consulta {i} {json.dumps(filters, ensure_ascii=False)}:\n{result}"
+        for i, (filters, result) in enumerate(zip(filter_sets, results), start=1)
+    )
+
+
+FILTER_FIELDS_DESCRIPTION = """Os campos disponíveis para filtro são: marca, modelo, ano_min, ano_max, tipo_combustivel,
+        quilometragem_max, numero_portas, placa_parcial, codigo_fipe.
+        Para tipo_combustivel, os valores válidos são: Gasolina, Etanol, Diesel, Flex, Elétrico, Híbrido."""
+
+# Só há implementação assíncrona (coroutine): o AgentExecutor é chamado com ainvoke,
+# no mesmo event loop do cliente HTTP.
 tools = [
     Tool(
         name="consultar_automoveis",
-        func=lambda filters: asyncio.run(
-            api_client.get_automoveis(filters)
-        ),  # Wrapper síncrono para func
-        coroutine_func=api_client.get_automoveis,
-        description="""Útil para consultar automóveis no estoque.
+        func=None,
+        coroutine=consultar_automoveis,
+        description=f"""Útil para consultar automóveis no estoque.
         Use esta ferramenta para encontrar veículos com base em filtros como marca, modelo, ano (min/max),
         tipo de combustível, quilometragem máxima, número de portas, placa parcial, ou código FIPE.
         A entrada para esta ferramenta deve ser um objeto JSON com os filtros do automóvel,
-        por exemplo: {"marca": "Toyota", "ano_min": 2020}.
-        Os campos disponíveis para filtro são: marca, modelo, ano_min, ano_max, tipo_combustivel,
-        quilometragem_max, numero_portas, placa_parcial, codigo_fipe.
-        Para tipo_combustivel, os valores válidos são: Gasolina, Etanol, Diesel, Flex, Elétrico, Híbrido.
+        por exemplo: {{"marca": "Toyota", "ano_min": 2020}}.
+        {FILTER_FIELDS_DESCRIPTION}
         """,
-        args_schema=AutomovelFilterToolSchema,
-    )
+    ),
+    Tool(
+        name="consultar_automoveis_em_lote",
+        func=None,
+        coroutine=consultar_automoveis_em_lote,
+        description=f"""Útil para comparar grupos de automóveis ou responder perguntas que pedem
+        várias buscas de uma vez (ex: "compare Toyotas e Hondas Flex depois de 2018").
+        As consultas são executadas em paralelo e o resultado de cada uma vem identificado.
+        A entrada deve ser uma lista JSON de objetos de filtros (até {BATCH_MAX_QUERIES}),
+        por exemplo: [{{"marca": "Toyota", "tipo_combustivel": "Flex", "ano_min": 2019}},
+        {{"marca": "Honda", "tipo_combustivel": "Flex", "ano_min": 2019}}].
+        {FILTER_FIELDS_DESCRIPTION}
+        """,
+    ),
 ]
 
 llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0.7)
@@ -108,6 +148,7 @@ Seu objetivo é ajudar o usuário a encontrar veículos e responder perguntas so
 Use as ferramentas disponíveis para consultar o estoque de veículos.
 Quando o usuário pedir informações sobre veículos, use a ferramenta `consultar_automoveis`.
 Sempre tente extrair os filtros mais específicos da pergunta do usuário para a ferramenta `consultar_automoveis`.
+Quando a pergunta comparar grupos de veículos ou exigir várias buscas, faça todas de uma vez com a ferramenta `consultar_automoveis_em_lote`.
 Se precisar de mais informações para refinar a busca (ex: "qual marca você prefere?", "qual o ano mínimo?"), peça ao usuário.
 Se não encontrar veículos, informe ao usuário e sugira outros filtros.
 
@@ -115,8 +156,8 @@ Responda usando o formato Thought/Action/Observation/Final Answer.
 
 Formato de Resposta Esperado:
 Thought: Eu preciso usar uma ferramenta para responder à pergunta do usuário.
-Action: consultar-automoveis
-Action Input: {{chave: valor, outra_chave: outro_valor}}
+Action: consultar_automoveis
+Action Input: {{"chave": "valor", "outra_chave": "outro_valor"}}
 Observation: O resultado da ferramenta aqui.
 Thought: Com base na observação, posso formar uma resposta final.
 Final Answer: Minha resposta final ao usuário.
@@ -136,11 +177,29 @@ prompt = PromptTemplate.from_template(template)
 
 
 agent = create_react_agent(llm, tools, prompt)
+# verbose desligado: os passos intermediários chegam ao CLI por stream_agent,
+# e os prints do executor atrapalhariam o Live do rich.
 agent_executor = AgentExecutor(
-    agent=agent, tools=tools, verbose=True, handle_parsing_errors=True
+    agent=agent,
+    tools=tools,
+    verbose=os.getenv("AGENT_VERBOSE", "").lower() in ("1", "true"),
+    handle_parsing_errors=True,
 )
 
 
+answer_cache = AnswerCache.from_env()
+
+
+async def stream_agent(input_text: str) -> AsyncIterator[AgentEvent]:
+    """Roda o agente emitindo tokens e chamadas de ferramenta à medida que acontecem."""
+    async for event in stream_agent_events(
+        agent_executor, input_text, api_client, answer_cache
+    ):
+        yield event
+
+
 async def run_agent(input_text: str) -> str:
-    response = await agent_executor.ainvoke({"input": input_text})
-    return response["output"]
+    async for event in stream_agent(input_text):
+        if event.kind == "answer":
+            return event.text
+    raise RuntimeError("O agente terminou sem produzir uma resposta.")
@@ -0,0 +1,121 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Protocol, Tuple
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    maxsize: int = 0
+    inventory_version: int = 0
+
+
+class CacheBackend(Protocol):
+    """Interface mínima para trocar o armazenamento do cache (ex: Redis no lugar da memória)."""
+
+    def get(self, key: Hashable, default: Any = None) -> Any: ...
+
+    def set(self, key: Hashable, value: Any) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+class LRUTTLCache:
+    """Cache em memória limitado por quantidade de entradas (LRU) e por tempo de vida (TTL)."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._stats = CacheStats(maxsize=maxsize)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return self._stats.model_copy(update={"size": len(self._data)})
+
+
+class QueryCache:
+    """
+    Cache de consultas de leitura versionado pelo estoque.
+    Toda escrita no CRUD incrementa `inventory_version`; como a versão faz parte da chave,
+    as entradas antigas deixam de ser encontradas e saem pelo LRU/TTL.
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.inventory_version = 0
+
+    def bump_version(self) -> None:
+        self.inventory_version += 1
+
+    def make_key(self, namespace: str, filters: Optional[BaseModel], **params) -> str:
+        """Chave canônica: ordem dos campos e filtros nulos não geram entradas diferentes."""
+        canonical: Dict[str, Any] = (
+            filters.model_dump(exclude_none=True) if filters else {}
+        )
+        canonical.update({k: v for k, v in params.items() if v is not None})
+        payload = json.dumps(canonical, sort_keys=True, default=str)
+        return f"{namespace}:{self.inventory_version}:{payload}"
+
+    def get(self, key: str) -> Any:
+        if not self.enabled:
+            return _MISSING
+        return self.backend.get(key, _MISSING)
+
+    def set(self, key: str, value: Any) -> None:
+        if self.enabled:
+            self.backend.set(key, value)
+
+    def stats(self) -> CacheStats:
+        return self.backend.stats().model_copy(
+            update={"inventory_version": self.inventory_version}
+        )
+
+
+def is_miss(value: Any) -> bool:
+    return value is _MISSING
+
+
+query_cache = QueryCache(
+    LRUTTLCache(maxsize=settings.QUERY_CACHE_MAXSIZE, ttl=settings.QUERY_CACHE_TTL),
+    enabled=settings.QUERY_CACHE_ENABLED,
+)
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,6 +11,37 @@ class AppSettings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL")
     model_config: dict = SettingsConfigDict(env_file=".env", extra="ignore")
     DATABASE_URL_TEST: str = "sqlite+aiosqlite:///:memory:"
+    # Réplica de leitura opcional para os GETs; sem ela tudo vai para o DATABASE_URL.
+    DATABASE_URL_READ: Optional[str] = None
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMAND_TIMEOUT: float = 30.0
+
+    PAGINATION_DEFAULT_LIMIT: int = 100
+    PAGINATION_MAX_LIMIT: int = 500
+
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    BULK_BATCH_SIZE: int = 1000
+    BULK_MAX_BATCH_SIZE: int = 2000
+    # Limite de linhas que um PATCH/DELETE por filtro pode alterar de uma vez.
+    BULK_MAX_AFFECTED: int = 1000
+
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_MAXSIZE: int = 256
+    QUERY_CACHE_TTL: float = 30.0
+
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    # Fração das consultas lentas (SELECT, PostgreSQL) reexecutadas com EXPLAIN ANALYZE.
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
 
 
 settings = AppSettings()
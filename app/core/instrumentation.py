@@ -0,0 +1,154 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import observe_query
+
+logger = logging.getLogger("app.db.slow_query")
+
+
+@dataclass
+class RequestTimings:
+    """Tempos acumulados de uma requisição, em segundos."""
+
+    query_count: int = 0
+    db_time: float = 0.0
+    serialization_time: float = 0.0
+    total_time: float = 0.0
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries", '
+            f"ser;dur={self.serialization_time * 1000:.2f}, "
+            f"total;dur={self.total_time * 1000:.2f}"
+        )
+
+
+# Preenchido pelo ServerTimingMiddleware; fora de uma requisição (scripts, testes de
+# CRUD) fica vazio e os eventos só cuidam do log de consultas lentas.
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextmanager
+def track_serialization() -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = current_timings.get()
+        if timings is not None:
+            timings.serialization_time += time.perf_counter() - started
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # No contexto de execução (um por comando) e não em conn.info: quando o comando
+    # falha o after_cursor_execute não dispara, e nada fica preso à conexão do pool.
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    if conn.info.get("explaining"):
+        return
+
+    observe_query(statement, elapsed)
+    timings = current_timings.get()
+    if timings is not None:
+        timings.query_count += 1
+        timings.db_time += elapsed
+
+    if elapsed * 1000 < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+    plan = None
+    if (
+        not executemany
+        and conn.dialect.name == "postgresql"
+        and statement.lstrip().upper().startswith("SELECT")
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    ):
+        plan = _explain(conn, statement, parameters)
+    logger.warning(
+        "Consulta lenta (%.1f ms): %s | parâmetros=%r%s",
+        elapsed * 1000,
+        statement,
+        parameters,
+        f"\n{plan}" if plan else "",
+    )
+
+
+def _explain(conn, statement, parameters) -> Optional[str]:
+    """
+    Reexecuta a consulta com EXPLAIN (ANALYZE, BUFFERS). Só é chamado para SELECTs
+    (o ANALYZE executa o comando de verdade) e dentro de um savepoint, para que uma
+    falha do EXPLAIN não aborte a transação da requisição. A flag `explaining` evita
+    que os eventos do próprio EXPLAIN sejam contados ou analisados de novo.
+    """
+    conn.info["explaining"] = True
+    try:
+        conn.exec_driver_sql("SAVEPOINT slow_query_explain")
+        try:
+            result = conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            plan = "\n".join(row[0] for row in result)
+            conn.exec_driver_sql("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as e:
+            conn.exec_driver_sql("ROLLBACK TO SAVEPOINT slow_query_explain")
+            logger.warning(f"Falha ao capturar o EXPLAIN. Erro={e}")
+            return None
+    finally:
+        conn.info["explaining"] = False
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class ServerTimingMiddleware:
+    """
+    Abre um RequestTimings por requisição HTTP e devolve o resultado no cabeçalho
+    Server-Timing (consultas e tempo de banco, serialização e total até o início
+    da resposta; em respostas em streaming, o que acontece depois não entra).
+    A serialização (`ser`) é a geração do corpo JSON pelas classes de resposta de
+    app/api/responses.py; a validação pelo response_model não entra nela.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timings.total_time = time.perf_counter() - started
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", timings.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
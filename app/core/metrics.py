@@ -0,0 +1,293 @@
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterable[str]:
+        """Linhas de amostra no formato de texto do Prometheus."""
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """Para contadores mantidos em outro lugar e só copiados na coleta."""
+        self.values[self._key(labels)] = value
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # Por combinação de labels: contagem por faixa (não cumulativa), soma e total.
+        self.values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts, totals = self.values.setdefault(
+            key, ([0] * len(self.buckets), [0.0, 0])
+        )
+        counts[bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def samples(self) -> Iterable[str]:
+        for key, (counts, (total, count)) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labelnames + ("le",), key + (_format_value(float(bound)),)
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {int(count)}"
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas em memória, renderizado no formato texto do Prometheus.
+    Todas as atualizações acontecem no event loop (inclusive os eventos do SQLAlchemy,
+    que rodam no greenlet da requisição), então não há trava.
+    """
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def on_collect(self, callback: Callable[[], None]) -> None:
+        """Callback chamado a cada coleta para copiar valores mantidos em outro lugar."""
+        self.collectors.append(callback)
+
+    def render(self) -> str:
+        for callback in self.collectors:
+            callback()
+        lines = [line for metric in self.metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(
+    Counter(
+        "http_requests_total",
+        "Requisições HTTP atendidas.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_LATENCY = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Duração das requisições HTTP até o fim do corpo da resposta.",
+        ("method", "route"),
+    )
+)
+HTTP_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "Requisições HTTP em andamento.")
+)
+HTTP_RESPONSE_SIZE = registry.register(
+    Histogram(
+        "http_response_size_bytes",
+        "Tamanho do corpo das respostas HTTP.",
+        ("method", "route"),
+        buckets=SIZE_BUCKETS,
+    )
+)
+DB_QUERIES = registry.register(
+    Counter("db_queries_total", "Comandos SQL executados, por tipo.", ("statement",))
+)
+DB_QUERY_LATENCY = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Duração dos comandos SQL, por tipo.",
+        ("statement",),
+        buckets=DB_LATENCY_BUCKETS,
+    )
+)
+DB_POOL_CHECKOUT_WAIT = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Espera por uma conexão do pool no início de cada sessão.",
+        ("pool",),
+        buckets=DB_LATENCY_BUCKETS,
+    )
+)
+DB_POOL_CONNECTIONS = registry.register(
+    Gauge("db_pool_connections", "Conexões do pool por estado.", ("pool", "state"))
+)
+QUERY_CACHE_EVENTS = registry.register(
+    Counter("query_cache_events_total", "Eventos do cache de consultas.", ("event",))
+)
+QUERY_CACHE_SIZE = registry.register(
+    Gauge("query_cache_size", "Entradas no cache de consultas.")
+)
+MCP_TOOL_CALLS = registry.register(
+    Counter("mcp_tool_calls_total", "Chamadas de ferramentas MCP.", ("tool", "outcome"))
+)
+
+_STATEMENT_TYPES = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def statement_type(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in _STATEMENT_TYPES else "OTHER"
+
+
+def observe_query(statement: str, seconds: float) -> None:
+    kind = statement_type(statement)
+    DB_QUERIES.inc(statement=kind)
+    DB_QUERY_LATENCY.observe(seconds, statement=kind)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Template completo da rota atendida (ex: /automoveis/{automovel_id}). Routers
+    incluídos podem guardar em scope["route"] só o caminho relativo ao prefixo, então
+    o prefixo é recuperado do caminho real da requisição.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    try:
+        suffix = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if suffix and path.endswith(suffix):
+        return path[: len(path) - len(suffix)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Mede cada requisição HTTP: latência até o fim do corpo (inclui respostas em
+    streaming), tamanho do corpo e requisições em andamento. O label `route` é o
+    template da rota (ex: /automoveis/{automovel_id}), para não explodir a cardinalidade.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            labels = {"method": scope["method"], "route": route_template(scope)}
+            HTTP_REQUESTS.inc(status=str(status_code), **labels)
+            HTTP_LATENCY.observe(time.perf_counter() - started, **labels)
+            HTTP_RESPONSE_SIZE.observe(size, **labels)
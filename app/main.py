@@ -1,18 +1,26 @@
 from fastapi import FastAPI
-from fastapi_mcp import FastApiMCP
 
-from app.api.endpoints import automovel_endpoints
+from app.api.endpoints import automovel_endpoints, system_endpoints
+from app.api.mcp import InstrumentedFastApiMCP
+from app.api.responses import TimedJSONResponse
+from app.core.instrumentation import ServerTimingMiddleware
+from app.core.metrics import MetricsMiddleware
 
 app = FastAPI(
     title="API de Automóveis",
     description="Uma API para gerenciar informações de automóveis, seguindo princípios SOLID.",
+    default_response_class=TimedJSONResponse,
 )
 
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(
     automovel_endpoints.router, prefix="/automoveis", tags=["Automóveis"]
 )
+app.include_router(system_endpoints.router, tags=["Sistema"])
 
-mcp = FastApiMCP(app, include_operations=["get_automoveis"])
+mcp = InstrumentedFastApiMCP(app, include_operations=["get_automoveis"])
 mcp.mount()
 mcp.setup_server()
 
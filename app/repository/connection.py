@@ -1,27 +1,292 @@
+import asyncio
 import logging
+import math
+import time
+from typing import Any, Dict, Optional
 
-from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
-                                    create_async_engine)
-from sqlalchemy.orm import declarative_base
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import AppSettings, settings
+from app.core.instrumentation import instrument_engine
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
+
+
+def build_engine_kwargs(url: str, app_settings: AppSettings) -> Dict[str, Any]:
+    """Traduz as configurações DB_* em argumentos do create_async_engine para o driver da URL."""
+    backend = make_url(url).get_backend_name()
+    kwargs: Dict[str, Any] = {"echo": app_settings.DB_ECHO}
+    if backend == "sqlite":
+        # O SQLite usa pools próprios (StaticPool/NullPool) que não aceitam dimensionamento.
+        return kwargs
+
+    kwargs.update(
+        pool_size=app_settings.DB_POOL_SIZE,
+        max_overflow=app_settings.DB_MAX_OVERFLOW,
+        pool_timeout=app_settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=app_settings.DB_POOL_PRE_PING,
+        pool_recycle=app_settings.DB_POOL_RECYCLE,
+    )
+    if make_url(url).get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {
+            "statement_cache_size": app_settings.DB_STATEMENT_CACHE_SIZE,
+            "command_timeout": app_settings.DB_COMMAND_TIMEOUT,
+        }
+    return kwargs
+
+
+class PoolStats(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int = 0
+    connections_opened: int = 0
+    connections_closed: int = 0
+    connections_invalidated: int = 0
+    checkout_wait_count: int = 0
+    checkout_wait_total_ms: float = 0.0
+    checkout_wait_max_ms: float = 0.0
+
+
+class PoolMonitor:
+    """Contadores do pool alimentados pelos eventos de pool do SQLAlchemy."""
+
+    def __init__(self, engine: AsyncEngine, name: str = "primary"):
+        self.engine = engine
+        self.name = name
+        self.checkouts = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.connections_invalidated = 0
+        self.checkout_wait_count = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+        pool = engine.sync_engine.pool
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "close", self._on_close)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connections_opened += 1
+
+    def _on_close(self, dbapi_connection, connection_record):
+        self.connections_closed += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.connections_invalidated += 1
+
+    def record_checkout_wait(self, seconds: float) -> None:
+        self.checkout_wait_count += 1
+        self.checkout_wait_total += seconds
+        self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+        DB_POOL_CHECKOUT_WAIT.observe(seconds, pool=self.name)
+
+    def snapshot(self) -> PoolStats:
+        pool = self.engine.sync_engine.pool
+        stats = PoolStats(
+            pool_class=type(pool).__name__,
+            checkouts=self.checkouts,
+            connections_opened=self.connections_opened,
+            connections_closed=self.connections_closed,
+            connections_invalidated=self.connections_invalidated,
+            checkout_wait_count=self.checkout_wait_count,
+            checkout_wait_total_ms=round(self.checkout_wait_total * 1000, 3),
+            checkout_wait_max_ms=round(self.checkout_wait_max * 1000, 3),
+        )
+        if isinstance(pool, QueuePool):
+            stats.size = pool.size()
+            stats.checked_in = pool.checkedin()
+            stats.checked_out = pool.checkedout()
+            stats.overflow = pool.overflow()
+        return stats
+
+
+class PoolWaitSession(Session):
+    """
+    Sessão que mede a espera pelo pool no momento em que a conexão é de fato pedida,
+    sem antecipar o checkout: uma requisição respondida pelo query_cache não chega a
+    tirar (nem a testar, com DB_POOL_PRE_PING) uma conexão do pool. O monitor vem de
+    `info["pool_monitor"]`; sessões sem ele não registram nada.
+    """
+
+
+@event.listens_for(PoolWaitSession, "do_orm_execute")
+def _mark_checkout_start(orm_execute_state) -> None:
+    # Só o comando que abre a transação dispara o after_begin e consome a marca;
+    # nos demais ela é descartada no fim da transação.
+    orm_execute_state.session.info["checkout_started"] = time.perf_counter()
+
+
+@event.listens_for(PoolWaitSession, "after_begin")
+def _record_checkout_wait(session, transaction, connection) -> None:
+    started = session.info.pop("checkout_started", None)
+    monitor = session.info.get("pool_monitor")
+    if started is not None and monitor is not None:
+        monitor.record_checkout_wait(time.perf_counter() - started)
 
-from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+@event.listens_for(PoolWaitSession, "after_transaction_end")
+def _clear_checkout_start(session, transaction) -> None:
+    session.info.pop("checkout_started", None)
+
+
+class ReplicaHealth:
+    """Depois de uma falha da réplica, desvia as leituras para o primário por um tempo."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        self.failures = 0
+        self.unhealthy_until = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def mark_failure(self) -> None:
+        self.failures += 1
+        self.unhealthy_until = time.monotonic() + self.retry_after
+
+
+# `engine` é o primário (escritas); `read_engine` aponta para a réplica quando
+# DATABASE_URL_READ está configurada e, caso contrário, é o próprio primário.
+engine = create_async_engine(
+    settings.DATABASE_URL, **build_engine_kwargs(settings.DATABASE_URL, settings)
+)
+pool_monitor = PoolMonitor(engine)
+instrument_engine(engine)
+
+if settings.DATABASE_URL_READ:
+    read_engine = create_async_engine(
+        settings.DATABASE_URL_READ,
+        **build_engine_kwargs(settings.DATABASE_URL_READ, settings),
+    )
+    read_pool_monitor = PoolMonitor(read_engine, name="replica")
+    instrument_engine(read_engine)
+else:
+    read_engine = engine
+    read_pool_monitor = pool_monitor
+replica_health = ReplicaHealth(settings.DB_REPLICA_RETRY_SECONDS)
 
 AsyncSessionLocal = async_sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=PoolWaitSession,
+    info={"pool_monitor": pool_monitor},
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    class_=AsyncSession,
+    sync_session_class=PoolWaitSession,
+    info={"pool_monitor": read_pool_monitor},
 )
 
 Base = declarative_base()
 
+# Cookie de read-your-writes: guarda até quando (epoch) as leituras vão ao primário.
+READ_YOUR_WRITES_COOKIE = "read_primary_until"
+
+
+def has_read_replica() -> bool:
+    return read_engine is not engine
+
+
+def pin_reads_to_primary(response: Response) -> None:
+    """
+    Dependência das rotas de escrita: por DB_READ_YOUR_WRITES_SECONDS as leituras do
+    mesmo cliente vão ao primário, para que ele veja a própria escrita mesmo com a
+    réplica atrasada.
+    """
+    seconds = settings.DB_READ_YOUR_WRITES_SECONDS
+    if seconds <= 0 or not has_read_replica():
+        return
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        f"{time.time() + seconds:.3f}",
+        max_age=math.ceil(seconds),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies[READ_YOUR_WRITES_COOKIE]) > time.time()
+    except (KeyError, ValueError):
+        return False
+
+
+async def _checked_out_session(session_factory: async_sessionmaker) -> AsyncSession:
+    """
+    Abre a sessão já com a conexão. Só é usado para a réplica: o checkout antecipado é
+    o que permite cair para o primário antes de a rota rodar, ao custo de tirar (e,
+    com DB_POOL_PRE_PING, testar) uma conexão mesmo quando a leitura vem do cache.
+    """
+    session = session_factory()
+    session.info["checkout_started"] = time.perf_counter()
+    try:
+        await session.connection()
+    except BaseException:
+        await session.close()
+        raise
+    return session
+
 
 async def get_db_session():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        except Exception as e:
-            logging.error(f"Falha ao gerar a conexão. Erro={e}")
-            await session.rollback()
-        finally:
-            await session.close()
+    session = AsyncSessionLocal()
+    try:
+        yield session
+    except Exception as e:
+        logging.error(f"Falha ao gerar a conexão. Erro={e}")
+        await session.rollback()
+    finally:
+        await session.close()
 
+
+async def get_read_session(request: Request):
+    """
+    Sessão para as rotas de leitura: usa a réplica quando configurada e saudável e o
+    cliente não escreveu há pouco (cookie de read-your-writes). Se a réplica não
+    entregar uma conexão, a leitura segue no primário sem erro para o cliente e a
+    réplica fica fora por DB_REPLICA_RETRY_SECONDS.
+    """
+    session = None
+    if (
+        has_read_replica()
+        and replica_health.available()
+        and not reads_pinned_to_primary(request)
+    ):
+        try:
+            session = await _checked_out_session(AsyncReadSessionLocal)
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+            logging.warning(f"Réplica de leitura indisponível, usando o primário. Erro={e}")
+            replica_health.mark_failure()
+    if session is None:
+        session = AsyncSessionLocal()
+    try:
+        yield session
+    except Exception as e:
+        logging.error(f"Falha ao gerar a conexão. Erro={e}")
+        await session.rollback()
+    finally:
+        await session.close()
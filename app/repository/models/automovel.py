@@ -1,10 +1,18 @@
-from sqlalchemy import Column, DateTime, Enum, Float, Integer, String
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Enum, Float, Index, Integer, String
 from sqlalchemy.sql import func
 
 from app.repository.connection import Base
 from app.schemas.automovel_schemas import TipoCombustivel
 
 
+def utcnow() -> datetime:
+    # Gerado na aplicação (e não com now() do banco) para ter precisão de microssegundos
+    # também no SQLite; é a base do ETag, então duas escritas no mesmo segundo precisam diferir.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Automovel(Base):
     __tablename__ = "automoveis"
 
@@ -22,6 +30,47 @@ class Automovel(Base):
     chassi = Column(String(17), unique=True, nullable=False)
     codigo_fipe = Column(String(10), nullable=False)
     created_at = Column(DateTime(timezone=False), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=False),
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    # Índices que atendem aos filtros de AutomovelCRUD.get_all_automoveis.
+    # Os compostos (coluna, id) também servem à ordenação com desempate por id do `order_by`.
+    # Os GIN com pg_trgm aceleram o ilike('%x%') e só existem no PostgreSQL;
+    # app/scripts/create_tables.py cria os que estiverem faltando em bancos já existentes.
+    __table_args__ = (
+        Index("ix_automoveis_tipo_combustivel_ano", "tipo_combustivel", "ano"),
+        Index("ix_automoveis_ano_id", "ano", "id"),
+        Index("ix_automoveis_quilometragem_id", "quilometragem", "id"),
+        Index("ix_automoveis_created_at_id", "created_at", "id"),
+        Index("ix_automoveis_marca_id", "marca", "id"),
+        Index("ix_automoveis_numero_portas", "numero_portas"),
+        Index("ix_automoveis_codigo_fipe", "codigo_fipe"),
+        # max(updated_at) da versão do estoque (GET /automoveis/inventory-version).
+        Index("ix_automoveis_updated_at", "updated_at"),
+        Index(
+            "ix_automoveis_marca_trgm",
+            "marca",
+            postgresql_using="gin",
+            postgresql_ops={"marca": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_automoveis_modelo_trgm",
+            "modelo",
+            postgresql_using="gin",
+            postgresql_ops={"modelo": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_automoveis_placa_trgm",
+            "placa",
+            postgresql_using="gin",
+            postgresql_ops={"placa": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     def __repr__(self):
         return (
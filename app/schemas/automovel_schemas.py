@@ -1,8 +1,9 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type, Union
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, create_model
 
 
 class TipoCombustivel(str, Enum):
@@ -68,6 +69,29 @@ class AutomovelCreate(AutomovelBase):
     pass
 
 
+class AutomovelPatch(BaseModel):
+    """
+    Alteração parcial de um automóvel: só os campos enviados são gravados.
+    Os campos obrigatórios não aceitam `null` (omitir é diferente de anular);
+    apenas `placa` pode ser removida com `null`.
+    """
+
+    marca: str = Field(None, example="Toyota")
+    modelo: str = Field(None, example="Corolla")
+    ano: int = Field(None, ge=1900, le=2100, example=2023)
+    cor: str = Field(None, example="Preto")
+    tipo_combustivel: TipoCombustivel = Field(None, example=TipoCombustivel.FLEX)
+    quilometragem: float = Field(None, ge=0, example=50000.5)
+    numero_portas: int = Field(None, ge=2, le=5, example=4)
+    placa: Optional[str] = Field(
+        None, pattern=r"^[A-Z]{3}[ -]?\d[A-Z\d]?\d{2}$", example="ABC1D23"
+    )
+    chassi: str = Field(None, pattern=r"^[0-9A-Z]{17}$", example="9BWZZZ5X0JP000001")
+    codigo_fipe: str = Field(None, min_length=6, max_length=10, example="005370-1")
+
+    model_config = ConfigDict(extra="forbid")
+
+
 class AutomovelInDataBase(AutomovelBase):
     id: int = Field(
         ..., example=1, description="ID único do automóvel gerado pelo sistema."
@@ -77,10 +101,92 @@ class AutomovelInDataBase(AutomovelBase):
         example=datetime.now(),
         description="Data e hora da criação do dado no banco.",
     )
+    updated_at: Optional[datetime] = Field(
+        None,
+        example=datetime.now(),
+        description="Data e hora da última alteração do dado no banco.",
+    )
 
     model_config = ConfigDict(arbitrary_types_allowed=True, from_attributes=True)
 
 
+AUTOMOVEL_FIELDS: Tuple[str, ...] = tuple(AutomovelInDataBase.model_fields)
+
+
+@lru_cache(maxsize=128)
+def partial_automovel_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Modelo com apenas os campos pedidos em `fields=`, reaproveitando as definições de AutomovelInDataBase."""
+    model_fields = AutomovelInDataBase.model_fields
+    return create_model(
+        "AutomovelParcial",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model_fields[name].annotation, model_fields[name]) for name in fields},
+    )
+
+
+class AutomovelPage(BaseModel):
+    items: List[AutomovelInDataBase]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor opaco para buscar a próxima página. Nulo na última página."
+    )
+
+
+class FacetBucket(BaseModel):
+    value: Union[int, str] = Field(..., description="Valor (ou início do intervalo) agrupado.")
+    count: int = Field(..., description="Quantidade de automóveis com esse valor.")
+
+
+class AutomovelFacets(BaseModel):
+    total: int = Field(..., description="Total de automóveis que atendem aos filtros.")
+    marca: List[FacetBucket] = []
+    tipo_combustivel: List[FacetBucket] = []
+    numero_portas: List[FacetBucket] = []
+    ano: List[FacetBucket] = Field(
+        [], description="Contagem por faixa de ano; `value` é o primeiro ano da faixa."
+    )
+    quilometragem_min: Optional[float] = None
+    quilometragem_max: Optional[float] = None
+
+
+class BulkItemStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    REJECTED = "rejected"
+
+
+class AutomovelBulkItemResult(BaseModel):
+    index: int = Field(..., description="Posição do item na lista enviada.")
+    status: BulkItemStatus
+    id: Optional[int] = Field(None, description="ID do automóvel criado ou atualizado.")
+    chassi: Optional[str] = None
+    errors: Optional[List[str]] = Field(
+        None, description="Motivos da rejeição do item, quando houver."
+    )
+
+
+class AutomovelBulkResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    rejected: int = 0
+    items: List[AutomovelBulkItemResult] = []
+
+
+class AutomovelBulkChange(BaseModel):
+    dry_run: bool = Field(..., description="Se verdadeiro, nada foi alterado: só a contagem.")
+    matched: int = Field(..., description="Automóveis que atendem aos filtros.")
+    affected: int = Field(..., description="Automóveis efetivamente alterados ou removidos.")
+
+
+class AutomovelInventoryVersion(BaseModel):
+    version: str = Field(
+        ..., description="Muda sempre que algum automóvel é criado, alterado ou removido."
+    )
+    total: int = Field(..., description="Quantidade de automóveis no estoque.")
+    last_modified: Optional[datetime] = Field(
+        None, description="Data e hora da escrita mais recente."
+    )
+
+
 class AutomovelFilter(BaseModel):
     marca: Optional[str] = Field(None, description="Filtrar por marca do automóvel.")
     modelo: Optional[str] = Field(
@@ -105,5 +211,12 @@ class AutomovelFilter(BaseModel):
         None, description="Filtrar por parte da placa (case-insensitive, contém)."
     )
     codigo_fipe: Optional[str] = Field(None, description="Filtrar por código FIPE.")
+    q: Optional[str] = Field(
+        None,
+        description=(
+            "Busca textual em marca, modelo, cor e placa (ignora acentos e caixa; "
+            "todas as palavras, por prefixo). Sem order_by, ordena por relevância."
+        ),
+    )
 
     model_config = ConfigDict(arbitrary_types_allowed=True, use_enum_values=True)
@@ -0,0 +1,160 @@
+"""
+Latência das chamadas de ferramenta do agente em cada transporte (inprocess, asgi, http).
+
+Popula o banco de `DATABASE_URL` até `--rows` automóveis e chama
+`AutomovelAPIClient.get_automoveis` (a mesma chamada feita pela ferramenta
+`consultar_automoveis`) com os filtros do teste de carga, em cada modo:
+sequencialmente, para a latência (p50/p95/p99), e com `--concurrency` chamadas
+simultâneas, para a vazão. O modo `http` sobe o uvicorn em outro processo, por isso o
+banco precisa ser um arquivo ou servidor. O cache de consultas fica desligado, a não
+ser com `--cache`, para a medida refletir o transporte e o banco.
+
+Uso:
+    DATABASE_URL=sqlite+aiosqlite:///./bench_agent.db python -m app.scripts.bench.agent_transport
+    DATABASE_URL=... python -m app.scripts.bench.agent_transport --modes inprocess,asgi --calls 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.engine import make_url
+
+from app.cli.automovel_client import (
+    AGENT_API_MODES,
+    AutomovelAPIClient,
+    HTTPBackend,
+    create_backend,
+)
+from app.core.cache import query_cache
+from app.core.config import settings
+from app.scripts.bench.load import (
+    LIST_FILTERS,
+    _summary,
+    seed,
+    start_server,
+    wait_until_ready,
+)
+
+FAILURE_PREFIXES = ("Ocorreu um erro", "Erro", "Filtros inválidos")
+
+
+async def _call(
+    client: AutomovelAPIClient, params: Dict[str, Any]
+) -> Tuple[str, float, bool]:
+    started = time.perf_counter()
+    result = await client.get_automoveis(params)
+    return (
+        "call",
+        time.perf_counter() - started,
+        not result.startswith(FAILURE_PREFIXES),
+    )
+
+
+async def measure_mode(
+    client: AutomovelAPIClient, calls: int, concurrency: int, rng: random.Random
+) -> Dict[str, Any]:
+    for (
+        params
+    ) in LIST_FILTERS:  # aquecimento: conexões, statement cache, JIT do pydantic
+        await client.get_automoveis(params)
+
+    started = time.perf_counter()
+    samples = [await _call(client, rng.choice(LIST_FILTERS)) for _ in range(calls)]
+    report = {"sequential": _summary(samples, time.perf_counter() - started)}
+
+    pending = iter(range(calls))
+    concurrent_samples: List[Tuple[str, float, bool]] = []
+
+    async def worker():
+        for _ in pending:
+            concurrent_samples.append(await _call(client, rng.choice(LIST_FILTERS)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report[f"concurrency_{concurrency}"] = _summary(
+        concurrent_samples, time.perf_counter() - started
+    )
+    return report
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    modes = [mode.strip() for mode in args.modes.split(",")]
+    for mode in modes:
+        if mode not in AGENT_API_MODES:
+            raise ValueError(f"Modo desconhecido: {mode!r}")
+    url = settings.DATABASE_URL
+    if make_url(url).database in (None, "", ":memory:"):
+        raise ValueError(
+            "Use um banco em arquivo ou servidor: o seeder e o modo http usam outras conexões."
+        )
+
+    if not args.cache:
+        query_cache.enabled = False
+        os.environ["QUERY_CACHE_ENABLED"] = "false"  # herdado pelo uvicorn do modo http
+    print(f"Populando até {args.rows} automóveis...", file=sys.stderr)
+    ids = await seed(url, args.rows, args.seed)
+
+    results: Dict[str, Any] = {}
+    for mode in modes:
+        server = None
+        if mode == "http":
+            server = start_server(url, args.host, args.port, 1)
+            base_url = f"http://{args.host}:{args.port}"
+            await wait_until_ready(base_url)
+            backend = HTTPBackend(base_url=base_url, max_connections=args.concurrency)
+        else:
+            backend = create_backend(mode)
+        # Sem o cache de resultados da ferramenta: cada chamada precisa chegar ao transporte.
+        client = AutomovelAPIClient(backend, cache_ttl=0)
+        try:
+            print(f"Modo {mode}...", file=sys.stderr)
+            results[mode] = await measure_mode(
+                client, args.calls, args.concurrency, random.Random(args.seed)
+            )
+        finally:
+            await client.aclose()
+            if server:
+                server.terminate()
+                server.wait(timeout=10)
+
+    return {
+        "database": make_url(url).get_backend_name(),
+        "rows": len(ids),
+        "calls": args.calls,
+        "query_cache": args.cache,
+        "modes": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", default=",".join(AGENT_API_MODES))
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--calls", type=int, default=200, help="Chamadas por medida.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--cache", action="store_true", help="Mantém o cache de consultas."
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: stdout).")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
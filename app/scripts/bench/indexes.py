@@ -0,0 +1,149 @@
+"""
+Benchmark dos índices de filtro do Automovel.
+
+Popula (se necessário) a tabela com N linhas sintéticas via generate_series e roda
+EXPLAIN (ANALYZE, BUFFERS) das consultas geradas por AutomovelCRUD para cada
+combinação de filtro, primeiro sem os índices gerenciados e depois com eles.
+Requer PostgreSQL: os índices são removidos e recriados na tabela configurada
+em DATABASE_URL, então use um banco de testes.
+
+Uso:
+    python -m app.scripts.bench.indexes --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select, text
+
+from app.repository.connection import Base, engine
+from app.repository.models.automovel import Automovel
+from app.schemas.automovel_schemas import AutomovelFilter, TipoCombustivel
+from app.scripts.create_tables import create_missing_indexes
+from app.view.automovel_crud import _apply_filters
+
+FILTER_CASES: Dict[str, AutomovelFilter] = {
+    "ano_range": AutomovelFilter(ano_min=2019, ano_max=2020),
+    "quilometragem_max": AutomovelFilter(quilometragem_max=1000),
+    "combustivel_ano_min": AutomovelFilter(
+        tipo_combustivel=TipoCombustivel.ELETRICO, ano_min=2022
+    ),
+    "numero_portas": AutomovelFilter(numero_portas=2),
+    "codigo_fipe": AutomovelFilter(codigo_fipe="004242-1"),
+    "marca_parcial": AutomovelFilter(marca="ssan"),
+    "modelo_parcial": AutomovelFilter(modelo="oroll"),
+    "placa_parcial": AutomovelFilter(placa_parcial="KQZ"),
+}
+
+SEED_SQL = """
+INSERT INTO automoveis (marca, modelo, ano, cor, tipo_combustivel, quilometragem,
+                        numero_portas, placa, chassi, codigo_fipe)
+SELECT
+    (ARRAY['Toyota','Honda','Chevrolet','Volkswagen','Fiat','Ford','Hyundai','Nissan',
+           'Renault','Jeep','BMW','Audi'])[1 + g % 12],
+    (ARRAY['Corolla','Civic','Onix','Gol','Argo','Ka','HB20','Kicks','Kwid','Renegade',
+           'X1','A3','Cruze','Polo','Toro'])[1 + (g / 12) % 15],
+    1990 + g % 36,
+    (ARRAY['Preto','Branco','Prata','Vermelho','Azul','Cinza'])[1 + (g / 7) % 6],
+    ((ARRAY['GASOLINA','ETANOL','DIESEL','FLEX','ELETRICO','HIBRIDO'])[1 + (g / 3) % 6])::tipo_combustivel_enum,
+    (g * 7919) % 250000,
+    (ARRAY[2, 4, 4, 4, 5])[1 + g % 5],
+    chr(65 + g % 26) || chr(65 + (g / 26) % 26) || chr(65 + (g / 676) % 26)
+        || lpad(((g / 17576) % 10000)::text, 4, '0'),
+    'BENCH' || lpad(g::text, 12, '0'),
+    lpad((g % 50000)::text, 6, '0') || '-' || (g % 10)::text
+FROM generate_series(:start, :stop) AS g
+"""
+
+
+def _compile(filters: AutomovelFilter) -> str:
+    query = _apply_filters(select(Automovel), filters)
+    return str(
+        query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    )
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> List[str]:
+    node = plan["Node Type"]
+    if plan.get("Index Name"):
+        node += f" ({plan['Index Name']})"
+    nodes = [node]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+async def _seed(conn, rows: int) -> None:
+    existing = (
+        await conn.execute(select(func.count()).select_from(Automovel))
+    ).scalar()
+    if existing >= rows:
+        return
+    print(f"Populando {rows - existing} linhas sintéticas...")
+    await conn.execute(text(SEED_SQL), {"start": existing + 1, "stop": rows})
+
+
+async def _explain_all(conn) -> Dict[str, Any]:
+    await conn.execute(text("ANALYZE automoveis"))
+    report = {}
+    for name, filters in FILTER_CASES.items():
+        result = await conn.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {_compile(filters)}")
+        )
+        explain = result.scalar()[0]
+        report[name] = {
+            "plan": _plan_nodes(explain["Plan"]),
+            "execution_ms": explain["Execution Time"],
+            "shared_buffers_read": explain["Plan"].get("Shared Read Blocks", 0),
+        }
+    return report
+
+
+async def run_benchmark(rows: int) -> Dict[str, Any]:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Este benchmark requer PostgreSQL em DATABASE_URL.")
+
+    managed_indexes = [
+        index
+        for index in Automovel.__table__.indexes
+        if index.name != "ix_automoveis_id"
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.create_all)
+        await _seed(conn, rows)
+
+    async with engine.begin() as conn:
+        for index in managed_indexes:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        sem_indices = await _explain_all(conn)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_indexes)
+        com_indices = await _explain_all(conn)
+
+    return {"rows": rows, "sem_indices": sem_indices, "com_indices": com_indices}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--output", help="Arquivo JSON para gravar o relatório.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.rows))
+    for name in FILTER_CASES:
+        before, after = report["sem_indices"][name], report["com_indices"][name]
+        print(
+            f"{name:22} {before['execution_ms']:>10.1f} ms -> {after['execution_ms']:>8.1f} ms"
+            f"   {before['plan'][0]} -> {after['plan'][0]}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Micro-benchmarks de AutomovelCRUD e dos schemas, com gate de regressão.
+
+Roda no mesmo SQLite em memória (aiosqlite + StaticPool) dos testes, com o cache
+de consultas desligado, e mede:
+- get_all_automoveis para cada combinação de filtros (até `--max-combo` filtros);
+- create_automovel e update_automovel;
+- validação de AutomovelBase/AutomovelInDataBase (inclui os regex de placa e chassi);
+- serialização de 10k AutomovelInDataBase (JSON do pydantic e orjson).
+
+Cada benchmark é repetido `--repeat` vezes e o resultado é a mediana do tempo por
+operação. Sem baseline, o arquivo é criado; com baseline, a execução termina com
+código 1 se algum benchmark ficar mais de `--tolerance` acima dele.
+
+Uso:
+    python -m app.scripts.bench.micro                      # compara com o baseline
+    python -m app.scripts.bench.micro --update-baseline    # grava um novo baseline
+    python -m app.scripts.bench.micro --only create --tolerance 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from itertools import combinations
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import query_cache
+from app.repository.connection import Base
+from app.schemas.automovel_schemas import (
+    AutomovelBase,
+    AutomovelCreate,
+    AutomovelFilter,
+    AutomovelInDataBase,
+    TipoCombustivel,
+)
+from app.scripts.seed_data import batch_specs, chassi_for, generate_batch, load_batch
+from app.view.automovel_crud import AutomovelCRUD
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "micro_baseline.json")
+
+# Um valor por filtro; as combinações são geradas a partir daqui.
+FILTER_VALUES: Dict[str, Any] = {
+    "marca": "Toyota",
+    "modelo": "oroll",
+    "ano_min": 2015,
+    "ano_max": 2020,
+    "tipo_combustivel": TipoCombustivel.FLEX,
+    "quilometragem_max": 50000,
+    "numero_portas": 4,
+    "placa_parcial": "AB",
+    "codigo_fipe": "003000-1",
+    "q": "toyota prata",
+}
+
+AUTOMOVEL_DICT = {
+    "marca": "Toyota",
+    "modelo": "Corolla",
+    "ano": 2022,
+    "cor": "Prata",
+    "tipo_combustivel": "Flex",
+    "quilometragem": 15000.0,
+    "numero_portas": 4,
+    "placa": "ABC1D23",
+    "chassi": "9BWZZZ5X0JP000001",
+    "codigo_fipe": "001234-5",
+}
+
+Benchmark = Callable[[], Awaitable[None]]
+
+
+def filter_combinations(max_combo: int) -> Dict[str, AutomovelFilter]:
+    cases = {"sem_filtros": AutomovelFilter()}
+    for size in range(1, max_combo + 1):
+        for names in combinations(FILTER_VALUES, size):
+            cases["+".join(names)] = AutomovelFilter(
+                **{name: FILTER_VALUES[name] for name in names}
+            )
+    return cases
+
+
+async def measure(benchmark: Benchmark, iterations: int, repeat: int) -> float:
+    """Mediana, entre as repetições, do tempo médio por operação (em microssegundos)."""
+    await benchmark()  # aquecimento
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await benchmark()
+        samples.append((time.perf_counter() - started) / iterations)
+    return round(statistics.median(samples) * 1e6, 3)
+
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, float]:
+    query_cache.enabled = False
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    for spec in batch_specs(0, args.rows, 5000, 42, 1.0, 0.15):
+        await load_batch(engine, generate_batch(spec))
+
+    session_factory = async_sessionmaker(
+        engine, expire_on_commit=False, class_=AsyncSession
+    )
+    results: Dict[str, float] = {}
+
+    async def run(name: str, benchmark: Benchmark, iterations: int) -> None:
+        if args.only and args.only not in name:
+            return
+        results[name] = await measure(benchmark, iterations, args.repeat)
+        print(f"{name}: {results[name]} µs/op", file=sys.stderr)
+
+    async with session_factory() as session:
+        crud = AutomovelCRUD(session)
+
+        for name, filters in filter_combinations(args.max_combo).items():
+            await run(
+                f"crud.get_all[{name}]",
+                lambda filters=filters: crud.get_all_automoveis(filters),
+                args.iterations,
+            )
+
+        created = 0
+
+        async def create():
+            nonlocal created
+            created += 1
+            chassi = f"MICRO{created:012d}"
+            await crud.create_automovel(
+                AutomovelCreate(**{**AUTOMOVEL_DICT, "placa": None, "chassi": chassi})
+            )
+
+        await run("crud.create", create, args.iterations)
+        # id 2 é a linha de índice 1 do seeder.
+        update = AutomovelBase(
+            **{**AUTOMOVEL_DICT, "chassi": chassi_for(1), "cor": "Azul"}
+        )
+        await run(
+            "crud.update", lambda: crud.update_automovel(2, update), args.iterations
+        )
+
+    rows = [
+        {**AUTOMOVEL_DICT, "id": i, "created_at": "2024-01-01T00:00:00"}
+        for i in range(args.models)
+    ]
+    models_adapter = TypeAdapter(List[AutomovelInDataBase])
+    models = models_adapter.validate_python(rows)
+
+    async def validate_base():
+        for row in rows:
+            AutomovelBase.model_validate(row)
+
+    async def validate_in_database():
+        models_adapter.validate_python(rows)
+
+    async def serialize_pydantic():
+        models_adapter.dump_json(models)
+
+    async def serialize_orjson():
+        orjson.dumps([model.model_dump() for model in models])
+
+    await run(f"schema.validate_base[{args.models}]", validate_base, 1)
+    await run(f"schema.validate_in_database[{args.models}]", validate_in_database, 1)
+    await run(f"schema.serialize_pydantic[{args.models}]", serialize_pydantic, 1)
+    await run(f"schema.serialize_model_dump_orjson[{args.models}]", serialize_orjson, 1)
+
+    await engine.dispose()
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> List[Dict[str, Any]]:
+    regressions = []
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if reference and value > reference * (1 + tolerance):
+            regressions.append(
+                {
+                    "benchmark": name,
+                    "baseline_us": reference,
+                    "current_us": value,
+                    "ratio": round(value / reference, 3),
+                }
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Ex: 0.2 = até 20%% mais lento."
+    )
+    parser.add_argument("--rows", type=int, default=5000, help="Linhas no banco.")
+    parser.add_argument(
+        "--models", type=int, default=10000, help="Modelos validados/serializados."
+    )
+    parser.add_argument(
+        "--max-combo", type=int, default=2, help="Filtros por combinação."
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only", help="Roda só os benchmarks cujo nome contém este texto."
+    )
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_benchmarks(args))
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(json.dumps({"baseline": args.baseline, "results": results}, indent=2))
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    print(
+        json.dumps(
+            {
+                "tolerance": args.tolerance,
+                "results": results,
+                "regressions": regressions,
+            },
+            indent=2,
+            ensure_ascii=False,
+        )
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Benchmark da serialização da listagem de automóveis.
+
+Compara, para 1k, 10k e 100k linhas em um SQLite em memória:
+- legacy: entidades ORM + model_validate por linha + revalidação e serialização
+  pelo response_model (o que o FastAPI fazia com List[AutomovelInDataBase]);
+- fast: tuplas de colunas + orjson direto (AutomovelCRUD.fetch_automoveis_rows).
+
+O cache de consultas fica desligado: senão as repetições do `fast` viriam da memória.
+
+Uso:
+    python -m app.scripts.bench.serialization --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.responses import ORJSONResponse
+from app.core.cache import query_cache
+from app.repository.connection import Base
+from app.repository.models.automovel import Automovel
+from app.schemas.automovel_schemas import AutomovelInDataBase, TipoCombustivel
+from app.view.automovel_crud import AutomovelCRUD
+
+RESPONSE_ADAPTER = TypeAdapter(List[AutomovelInDataBase])
+
+
+def _rows(size: int) -> List[Dict]:
+    combustiveis = list(TipoCombustivel)
+    return [
+        {
+            "marca": "Toyota",
+            "modelo": "Corolla",
+            "ano": 2000 + i % 25,
+            "cor": "Preto",
+            "tipo_combustivel": combustiveis[i % len(combustiveis)],
+            "quilometragem": float(i),
+            "numero_portas": 4,
+            "placa": None,
+            "chassi": f"SER{i:014d}",
+            "codigo_fipe": "005370-1",
+        }
+        for i in range(size)
+    ]
+
+
+async def _legacy(session: AsyncSession, size: int) -> bytes:
+    result = await session.execute(select(Automovel).limit(size))
+    items = [
+        AutomovelInDataBase.model_validate(auto) for auto in result.scalars().all()
+    ]
+    return RESPONSE_ADAPTER.dump_json(RESPONSE_ADAPTER.validate_python(items))
+
+
+async def _fast(session: AsyncSession, size: int) -> bytes:
+    rows, _ = await AutomovelCRUD(session).fetch_automoveis_rows(limit=size)
+    return ORJSONResponse(rows).body
+
+
+async def _best_of(func, session_factory, size: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            await func(session, size)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def run_benchmark(sizes: List[int], repeat: int) -> Dict[str, Dict]:
+    query_cache.enabled = False
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Automovel), _rows(max(sizes)))
+    session_factory = async_sessionmaker(engine, class_=AsyncSession)
+
+    report = {}
+    for size in sizes:
+        legacy = await _best_of(_legacy, session_factory, size, repeat)
+        fast = await _best_of(_fast, session_factory, size, repeat)
+        report[str(size)] = {
+            "legacy_ms": round(legacy * 1000, 2),
+            "fast_ms": round(fast * 1000, 2),
+            "speedup": round(legacy / fast, 2),
+        }
+    await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.sizes, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Comparação de latência das escritas de AutomovelCRUD.
+
+Mede create/update/delete na implementação atual (um statement com RETURNING)
+contra a implementação anterior (add/commit/refresh, get/setattr/commit/refresh
+e get/delete/commit), ambas sobre o banco de DATABASE_URL ou a URL informada.
+
+Uso:
+    python -m app.scripts.bench.writes --ops 500
+    python -m app.scripts.bench.writes --url sqlite+aiosqlite:///:memory:
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.repository.connection import Base
+from app.repository.models.automovel import Automovel
+from app.schemas.automovel_schemas import (
+    AutomovelBase,
+    AutomovelCreate,
+    AutomovelInDataBase,
+    TipoCombustivel,
+)
+from app.view.automovel_crud import AutomovelCRUD
+
+
+class LegacyAutomovelCRUD(AutomovelCRUD):
+    """Escritas como eram antes do RETURNING, mantidas apenas para comparação."""
+
+    async def create_automovel(self, automovel: AutomovelBase) -> AutomovelInDataBase:
+        new_automovel_orm = Automovel(**automovel.model_dump())
+        self.db_session.add(new_automovel_orm)
+        await self.db_session.commit()
+        await self.db_session.refresh(new_automovel_orm)
+        return AutomovelInDataBase.model_validate(new_automovel_orm)
+
+    async def update_automovel(
+        self, automovel_id: int, automovel_update: AutomovelBase
+    ) -> Optional[AutomovelInDataBase]:
+        automovel_orm = await self.db_session.get(Automovel, automovel_id)
+        if not automovel_orm:
+            return None
+        for key, value in automovel_update.model_dump(exclude_unset=True).items():
+            setattr(automovel_orm, key, value)
+        await self.db_session.commit()
+        await self.db_session.refresh(automovel_orm)
+        return AutomovelInDataBase.model_validate(automovel_orm)
+
+    async def delete_automovel(self, automovel_id: int) -> bool:
+        automovel_to_delete = await self.db_session.get(Automovel, automovel_id)
+        if not automovel_to_delete:
+            return False
+        await self.db_session.delete(automovel_to_delete)
+        await self.db_session.commit()
+        return True
+
+
+def _automovel(prefix: str, i: int) -> AutomovelCreate:
+    return AutomovelCreate(
+        marca="Bench",
+        modelo="Escrita",
+        ano=2020,
+        cor="Branco",
+        tipo_combustivel=TipoCombustivel.FLEX,
+        quilometragem=float(i),
+        numero_portas=4,
+        placa=None,
+        chassi=f"{prefix}{i:0{17 - len(prefix)}d}",
+        codigo_fipe="001234-5",
+    )
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95)] * 1000, 3),
+    }
+
+
+async def _run(crud_class, session_factory, prefix: str, ops: int) -> Dict[str, Dict]:
+    timings: Dict[str, List[float]] = {"create": [], "update": [], "delete": []}
+    ids = []
+    async with session_factory() as session:
+        crud = crud_class(session)
+        for i in range(ops):
+            started = time.perf_counter()
+            created = await crud.create_automovel(_automovel(prefix, i))
+            timings["create"].append(time.perf_counter() - started)
+            ids.append(created.id)
+        for i, automovel_id in enumerate(ids):
+            data = _automovel(prefix, i).model_copy(update={"cor": "Preto"})
+            started = time.perf_counter()
+            await crud.update_automovel(automovel_id, data)
+            timings["update"].append(time.perf_counter() - started)
+        for automovel_id in ids:
+            started = time.perf_counter()
+            await crud.delete_automovel(automovel_id)
+            timings["delete"].append(time.perf_counter() - started)
+    return {op: _summary(samples) for op, samples in timings.items()}
+
+
+async def run_benchmark(url: str, ops: int) -> Dict[str, Dict]:
+    engine_kwargs = {"poolclass": StaticPool} if url.startswith("sqlite") else {}
+    engine = create_async_engine(url, **engine_kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession)
+
+    report = {
+        "legacy": await _run(LegacyAutomovelCRUD, session_factory, "BENCHLEG", ops),
+        "returning": await _run(AutomovelCRUD, session_factory, "BENCHRET", ops),
+    }
+    await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--ops", type=int, default=500)
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.url, args.ops))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,69 @@ import sys
 # ocorrendo dos imports. Essa solução veio de IA.
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from sqlalchemy import text
+
 from app.repository.connection import Base, engine
-from app.repository.models.automovel import \
-    Automovel  # Tive que importar para o Base.metada conseguir encontrar
+from app.repository.models.automovel import (
+    Automovel,  # Tive que importar para o Base.metada conseguir encontrar
+)
+
+# Índices substituídos por versões compostas com id (ordenação estável do order_by).
+OBSOLETE_INDEXES = ["ix_automoveis_ano", "ix_automoveis_quilometragem"]
+
+# Migração da busca textual no PostgreSQL (idempotente). O unaccent não é IMMUTABLE,
+# então é embrulhado em f_unaccent para poder ser usado na coluna gerada e no índice.
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """,
+    """
+    ALTER TABLE automoveis ADD COLUMN IF NOT EXISTS busca tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', f_unaccent(
+            coalesce(marca, '') || ' ' || coalesce(modelo, '') || ' ' ||
+            coalesce(cor, '') || ' ' || coalesce(placa, '')
+        ))
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_automoveis_busca ON automoveis USING gin (busca)",
+]
+
+
+def create_missing_indexes(sync_conn) -> None:
+    """
+    O create_all não cria índices novos em tabelas que já existem, então cada índice
+    declarado no modelo é criado individualmente com checkfirst (idempotente).
+    """
+    for index in Automovel.__table__.indexes:
+        index.create(sync_conn, checkfirst=True)
+    for name in OBSOLETE_INDEXES:
+        sync_conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
 
 
 async def create_db_and_tables():
     print("Iniciando a criação de tabelas no banco de dados...")
     try:
         async with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             await conn.run_sync(Base.metadata.create_all)
+            if conn.dialect.name == "postgresql":
+                # Colunas adicionadas depois da criação original da tabela.
+                await conn.execute(
+                    text(
+                        "ALTER TABLE automoveis ADD COLUMN IF NOT EXISTS updated_at "
+                        "TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()"
+                    )
+                )
+                for statement in POSTGRES_SEARCH_DDL:
+                    await conn.execute(text(statement))
+            await conn.run_sync(create_missing_indexes)
 
-        print("Tabelas criadas com sucesso ou já existentes no banco de dados.")
+        print("Tabelas e índices criados com sucesso ou já existentes no banco de dados.")
     except Exception as e:
         print(f"Ocorreu um erro inesperado ao criar tabelas: {e}")
 
@@ -1,78 +1,368 @@
+"""
+Seeder em massa de automóveis.
+
+Gera os dados em lotes com um RNG de semente fixa (o mesmo `--seed` produz sempre
+as mesmas linhas, com ou sem processos auxiliares) e carrega cada lote com COPY
+(`copy_records_to_table` do asyncpg) no PostgreSQL ou com INSERT multi-linha nos
+demais bancos. `chassi` e `placa` são derivados do índice da linha, então nunca
+se repetem. A popularidade das marcas segue uma Zipf (`--brand-skew`) e a idade
+dos veículos decai exponencialmente (`--age-skew`).
+
+Uso:
+    python -m app.scripts.seed_data --rows 1000000 --workers 4
+    python -m app.scripts.seed_data --rows 10000 --brand-skew 0 --age-skew 0 --truncate
+"""
+
+import argparse
 import asyncio
-from datetime import datetime
-from typing import List
+import math
+import os
+import random
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-from faker import Faker
-from faker_vehicle import VehicleProvider
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 
 from app.core.config import settings
-from app.repository.models.automovel import Automovel, Base
+from app.repository.connection import Base, build_engine_kwargs
+from app.repository.models.automovel import Automovel, utcnow
+
+MODELOS_POR_MARCA: Dict[str, List[str]] = {
+    "Volkswagen": ["Gol", "Polo", "T-Cross", "Virtus", "Nivus", "Saveiro", "Amarok"],
+    "Chevrolet": ["Onix", "Tracker", "Cruze", "S10", "Spin", "Montana"],
+    "Fiat": ["Argo", "Mobi", "Strada", "Toro", "Pulse", "Cronos", "Fastback"],
+    "Toyota": ["Corolla", "Hilux", "Yaris", "Corolla Cross", "SW4", "Etios"],
+    "Hyundai": ["HB20", "Creta", "Tucson", "HB20S"],
+    "Renault": ["Kwid", "Sandero", "Duster", "Logan", "Oroch"],
+    "Honda": ["Civic", "City", "HR-V", "Fit", "WR-V"],
+    "Jeep": ["Renegade", "Compass", "Commander"],
+    "Ford": ["Ka", "EcoSport", "Ranger", "Territory"],
+    "Nissan": ["Kicks", "Versa", "Frontier", "Sentra"],
+    "Peugeot": ["208", "2008", "3008"],
+    "Citroën": ["C3", "C4 Cactus", "Aircross"],
+    "BMW": ["X1", "320i", "X3"],
+    "Audi": ["A3", "Q3", "A4"],
+    "Mitsubishi": ["L200", "Outlander", "Eclipse Cross"],
+}
+MARCAS = list(MODELOS_POR_MARCA)
+INDICE_MARCA = {marca: i for i, marca in enumerate(MARCAS)}
+
+CORES = ["Branco", "Prata", "Preto", "Cinza", "Vermelho", "Azul", "Marrom", "Verde"]
+PESOS_CORES = [30, 22, 20, 14, 6, 5, 2, 1]
+
+# Nomes dos membros de TipoCombustivel: é o que o Enum do modelo grava no banco.
+COMBUSTIVEIS = ["FLEX", "GASOLINA", "DIESEL", "ETANOL", "HIBRIDO", "ELETRICO"]
+PESOS_COMBUSTIVEIS = [60, 18, 10, 6, 4, 2]
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+PORTAS = [2, 4, 5]
+PESOS_PORTAS = [10, 70, 20]
+
+ANO_MINIMO = 1990
+KM_POR_ANO = 12000
+
+COLUMNS = (
+    "marca",
+    "modelo",
+    "ano",
+    "cor",
+    "tipo_combustivel",
+    "quilometragem",
+    "numero_portas",
+    "placa",
+    "chassi",
+    "codigo_fipe",
 )
+Record = Tuple
 
-fake = Faker("pt_BR")
-fake.add_provider(VehicleProvider)
 
+class BatchSpec(NamedTuple):
+    seed: int
+    start: int
+    count: int
+    brand_skew: float
+    age_skew: float
+    current_year: int
 
-def generate_fake_automovel_data(num_automoveis: int) -> List[Automovel]:
-    automoveis = []
-    for _ in range(num_automoveis):
-        ano = fake.random_int(min=1990, max=datetime.now().year + 1)
 
-        tipos_combustivel = [
-            "Gasolina",
-            "Etanol",
-            "Diesel",
-            "Flex",
-            "Elétrico",
-            "Híbrido",
-        ]
-        tipo_combustivel = fake.random_element(elements=tipos_combustivel)
-
-        letras = "".join(fake.random_letters(length=3)).upper()
-        numeros = str(fake.random_int(min=0, max=9))
-        mercosul_num = str(fake.random_int(min=0, max=9))
-        final_numeros = str(fake.random_int(min=0, max=99)).zfill(2)
-        placa = f"{letras}-{numeros}{mercosul_num}{final_numeros}"
-
-        automoveis.append(
-            Automovel(
-                marca=fake.vehicle_make(),
-                modelo=fake.vehicle_model(),
-                ano=ano,
-                cor=fake.color_name(),
-                tipo_combustivel=tipo_combustivel,
-                quilometragem=fake.random_int(min=0, max=200000),
-                numero_portas=fake.random_element(elements=[2, 4]),
-                placa=placa,
-                chassi=fake.vin(),
-                codigo_fipe=str(fake.random_int(min=100000, max=999999)),
+def _cumulative(weights: Sequence[float]) -> List[float]:
+    total, cumulative = 0.0, []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+CHASSI_PREFIX = "9BS"
+
+
+def chassi_for(index: int) -> str:
+    return f"{CHASSI_PREFIX}{index:014d}"
+
+
+def placa_for(index: int) -> str:
+    """Formato antigo (AAA0000): 3 letras do índice / 10000 e 4 dígitos do resto."""
+    letters, n = "", index // 10000
+    for _ in range(3):
+        n, r = divmod(n, 26)
+        letters += string.ascii_uppercase[r]
+    if n:
+        raise ValueError(f"Índice {index} excede as placas únicas disponíveis.")
+    return f"{letters}{index % 10000:04d}"
+
+
+def generate_batch(spec: BatchSpec) -> List[Record]:
+    """
+    Gera as linhas de índices [start, start + count). O RNG é semeado pelo par
+    (seed, start), então o resultado não depende de qual processo gerou o lote.
+    Cada coluna é sorteada de uma vez com `choices(k=count)`.
+    """
+    rng = random.Random(f"{spec.seed}:{spec.start}")
+    n = spec.count
+
+    pesos_marcas = [1 / (rank + 1) ** spec.brand_skew for rank in range(len(MARCAS))]
+    marcas = rng.choices(MARCAS, cum_weights=_cumulative(pesos_marcas), k=n)
+
+    idades_possiveis = list(range(spec.current_year + 1 - ANO_MINIMO))
+    pesos_idades = [math.exp(-spec.age_skew * idade) for idade in idades_possiveis]
+    idades = rng.choices(idades_possiveis, cum_weights=_cumulative(pesos_idades), k=n)
+
+    cores = rng.choices(CORES, cum_weights=_cumulative(PESOS_CORES), k=n)
+    combustiveis = rng.choices(
+        COMBUSTIVEIS, cum_weights=_cumulative(PESOS_COMBUSTIVEIS), k=n
+    )
+    portas = rng.choices(PORTAS, cum_weights=_cumulative(PESOS_PORTAS), k=n)
+    ruidos = [rng.random() for _ in range(n)]
+    modelos_idx = [rng.random() for _ in range(n)]
+
+    records = []
+    for offset in range(n):
+        index = spec.start + offset
+        marca = marcas[offset]
+        modelos = MODELOS_POR_MARCA[marca]
+        modelo_idx = int(modelos_idx[offset] * len(modelos))
+        idade = idades[offset]
+        # Quilometragem proporcional à idade, com ±50% de variação.
+        km = round(max(idade, 0.2) * KM_POR_ANO * (0.5 + ruidos[offset]), 1)
+        records.append(
+            (
+                marca,
+                modelos[modelo_idx],
+                spec.current_year - idade,
+                cores[offset],
+                combustiveis[offset],
+                km,
+                portas[offset],
+                placa_for(index),
+                chassi_for(index),
+                f"{INDICE_MARCA[marca]:03d}{modelo_idx:03d}-{index % 10}",
             )
         )
-    return automoveis
+    return records
 
 
-async def insert_fake_data(num_automoveis: int):
-    automoveis = generate_fake_automovel_data(num_automoveis)
-    async with AsyncSessionLocal() as session:
-        session.add_all(automoveis)
-        await session.commit()
-    print(f"Inseridos {num_automoveis} veículos falsos no banco de dados.")
+def batch_specs(
+    start: int,
+    rows: int,
+    batch_size: int,
+    seed: int,
+    brand_skew: float,
+    age_skew: float,
+) -> List[BatchSpec]:
+    current_year = date.today().year
+    return [
+        BatchSpec(
+            seed,
+            offset,
+            min(batch_size, start + rows - offset),
+            brand_skew,
+            age_skew,
+            current_year,
+        )
+        for offset in range(start, start + rows, batch_size)
+    ]
 
 
-async def main():
+async def _copy_records(conn: AsyncConnection, records: List[Record]) -> None:
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        Automovel.__tablename__, records=records, columns=COLUMNS
+    )
+
+
+async def _insert_records(conn: AsyncConnection, records: List[Record]) -> None:
+    """
+    INSERT compilado uma vez e executado com executemany direto no driver: os valores
+    já estão no formato do banco (o combustível pelo nome do membro), então não há
+    por que pagar o processamento de parâmetros do SQLAlchemy linha a linha. Só o
+    `updated_at` (default do lado Python) é convertido, uma vez por lote.
+    """
+    table = Automovel.__table__
+    compiled = insert(table).compile(dialect=conn.dialect, column_keys=list(COLUMNS))
+    processor = table.c.updated_at.type.bind_processor(conn.dialect)
+    now = processor(utcnow()) if processor else utcnow()
+    names = compiled.positiontup if compiled.positional else list(compiled.params)
+
+    positions = [COLUMNS.index(name) if name in COLUMNS else None for name in names]
+    rows = (
+        tuple(now if i is None else record[i] for i in positions) for record in records
+    )
+    if compiled.positional:
+        params = list(rows)
+    else:
+        params = [dict(zip(names, row)) for row in rows]
+    await conn.exec_driver_sql(str(compiled), params)
+
+
+async def load_batch(engine: AsyncEngine, records: List[Record]) -> None:
+    async with engine.begin() as conn:
+        if engine.dialect.driver == "asyncpg":
+            await _copy_records(conn, records)
+        else:
+            await _insert_records(conn, records)
+
+
+async def next_seed_index(conn: AsyncConnection) -> int:
+    """
+    Índice seguinte ao maior chassi já gerado pelo seeder. Não usa a contagem de
+    linhas: depois de remoções ela fica abaixo do maior índice e repetiria chassis.
+    Como o índice tem 14 dígitos com zeros à esquerda, a ordem do texto é a numérica.
+    """
+    result = await conn.execute(
+        select(func.max(Automovel.chassi)).where(
+            Automovel.chassi >= chassi_for(0),
+            Automovel.chassi <= chassi_for(10**14 - 1),
+        )
+    )
+    highest = result.scalar_one()
+    if highest is None:
+        return 0
     try:
-        print(f"Iniciando a inserção de {120} veículos falsos.")
-        await insert_fake_data(120)
+        return int(highest[len(CHASSI_PREFIX) :]) + 1
+    except ValueError:
+        raise ValueError(
+            f"O chassi {highest} não foi gerado pelo seeder; informe o índice inicial com --start."
+        ) from None
+
+
+async def seed_automoveis(
+    engine: AsyncEngine,
+    rows: int,
+    seed: int = 42,
+    batch_size: int = 10000,
+    workers: int = 0,
+    brand_skew: float = 1.0,
+    age_skew: float = 0.15,
+    start: Optional[int] = None,
+) -> int:
+    """
+    Insere `rows` automóveis a partir do índice `start` (padrão: o seguinte ao maior
+    já gerado, para que execuções seguidas continuem a numeração).
+    Com `workers`, os lotes são gerados em paralelo enquanto o anterior é carregado.
+    Retorna o índice seguinte ao último inserido.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if start is None:
+            start = await next_seed_index(conn)
+
+    specs = batch_specs(start, rows, batch_size, seed, brand_skew, age_skew)
+    if workers <= 0:
+        for spec in specs:
+            await load_batch(engine, generate_batch(spec))
+        return start + rows
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        queued = min(workers * 2, len(specs))
+        pending = [
+            loop.run_in_executor(executor, generate_batch, spec)
+            for spec in specs[:queued]
+        ]
+        while pending:
+            records = await pending.pop(0)
+            if queued < len(specs):
+                pending.append(
+                    loop.run_in_executor(executor, generate_batch, specs[queued])
+                )
+                queued += 1
+            await load_batch(engine, records)
+    return start + rows
+
+
+async def main(args: argparse.Namespace):
+    engine = create_async_engine(args.url, **build_engine_kwargs(args.url, settings))
+    try:
+        if args.truncate:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(text(f"DELETE FROM {Automovel.__tablename__}"))
+
+        print(f"Iniciando a inserção de {args.rows} veículos falsos.")
+        started = time.perf_counter()
+        await seed_automoveis(
+            engine,
+            rows=args.rows,
+            seed=args.seed,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            brand_skew=args.brand_skew,
+            age_skew=args.age_skew,
+            start=args.start,
+        )
+        if engine.dialect.name == "postgresql":
+            async with engine.begin() as conn:
+                await conn.execute(text(f"ANALYZE {Automovel.__tablename__}"))
+        elapsed = time.perf_counter() - started
+        print(
+            f"Inseridos {args.rows} veículos em {elapsed:.1f}s "
+            f"({args.rows / elapsed:,.0f} linhas/s)."
+        )
         print("Operação de seed concluída com sucesso!")
     except Exception as e:
         print(f"Ocorreu um erro inesperado: {e}")
+    finally:
+        await engine.dispose()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"Processos de geração (0 = no processo atual; esta máquina tem {os.cpu_count()}).",
+    )
+    parser.add_argument(
+        "--brand-skew",
+        type=float,
+        default=1.0,
+        help="Expoente da Zipf das marcas (0 = todas igualmente populares).",
+    )
+    parser.add_argument(
+        "--age-skew",
+        type=float,
+        default=0.15,
+        help="Decaimento exponencial por ano de idade (0 = anos uniformes).",
+    )
+    parser.add_argument(
+        "--start",
+        type=int,
+        default=None,
+        help="Índice da primeira linha (padrão: o seguinte ao maior chassi já gerado).",
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="Apaga os automóveis existentes antes."
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))
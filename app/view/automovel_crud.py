@@ -1,10 +1,179 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from sqlalchemy import select
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import (
+    Float,
+    Integer,
+    Select,
+    String,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    null,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repository.models.automovel import Automovel
-from app.schemas.automovel_schemas import (AutomovelFilter, AutomovelInDataBase, AutomovelBase)
+from app.core.cache import is_miss, query_cache
+from app.core.config import settings
+from app.repository.models.automovel import Automovel, utcnow
+from app.schemas.automovel_schemas import (
+    AutomovelBase,
+    AutomovelBulkChange,
+    AutomovelBulkItemResult,
+    AutomovelBulkResult,
+    AutomovelCreate,
+    AutomovelFacets,
+    AutomovelFilter,
+    AutomovelInDataBase,
+    AutomovelInventoryVersion,
+    AutomovelPage,
+    AutomovelPatch,
+    BulkItemStatus,
+    FacetBucket,
+    TipoCombustivel,
+)
+from app.view.pagination import (
+    SORTABLE_COLUMNS,
+    SortKey,
+    cursor_for,
+    cursor_values,
+    keyset_predicate,
+    order_clauses,
+    parse_order_by,
+)
+from app.view.search import search_match, search_rank, search_terms
+
+AUTOMOVEL_COLUMNS = tuple(Automovel.__table__.columns)
+
+# Construído uma única vez: valida uma lista inteira em uma chamada ao pydantic-core.
+AUTOMOVEL_LIST_ADAPTER = TypeAdapter(List[AutomovelInDataBase])
+
+# Chave de ordenação implícita das buscas com `q` (não aceita em `order_by`).
+RELEVANCE_KEY = "relevancia"
+
+# Colunas únicas: não faz sentido gravar o mesmo valor em vários automóveis.
+BULK_PATCH_FORBIDDEN = ("chassi", "placa")
+
+
+class BulkLimitExceededError(ValueError):
+    """A alteração por filtro atingiria mais automóveis do que o limite permitido."""
+
+    def __init__(self, matched: int, limit: int):
+        self.matched = matched
+        self.limit = limit
+        super().__init__(
+            f"A operação atingiria {matched} automóveis; o limite é {limit}. "
+            "Refine os filtros."
+        )
+
+
+def _apply_filters(query: Select, filters: Optional[AutomovelFilter]) -> Select:
+    if not filters:
+        return query
+
+    if filters.marca:
+        query = query.filter(Automovel.marca.ilike(f"%{filters.marca}%"))
+    if filters.modelo:
+        query = query.filter(Automovel.modelo.ilike(f"%{filters.modelo}%"))
+    if filters.ano_min is not None:
+        query = query.filter(Automovel.ano >= filters.ano_min)
+    if filters.ano_max is not None:
+        query = query.filter(Automovel.ano <= filters.ano_max)
+    if filters.tipo_combustivel:
+        query = query.filter(Automovel.tipo_combustivel == filters.tipo_combustivel)
+    if filters.quilometragem_max is not None:
+        query = query.filter(Automovel.quilometragem <= filters.quilometragem_max)
+    if filters.numero_portas is not None:
+        query = query.filter(Automovel.numero_portas == filters.numero_portas)
+    if filters.placa_parcial:
+        query = query.filter(Automovel.placa.ilike(f"%{filters.placa_parcial}%"))
+    if filters.codigo_fipe:
+        query = query.filter(Automovel.codigo_fipe == filters.codigo_fipe)
+    terms = search_terms(filters.q) if filters.q else ()
+    if terms:
+        query = query.filter(search_match(terms))
+    return query
+
+
+def _sort_plan(
+    filters: Optional[AutomovelFilter], order_by: Optional[str]
+) -> Tuple[Tuple[SortKey, ...], Mapping[str, Any]]:
+    """
+    Chaves de ordenação e as expressões que elas usam. Uma busca `q` sem `order_by`
+    é ordenada pela relevância (maior primeiro), que também entra no cursor.
+    """
+    sort_keys = parse_order_by(order_by)
+    terms = search_terms(filters.q) if filters and filters.q else ()
+    if not terms:
+        return sort_keys, SORTABLE_COLUMNS
+    columns = {**SORTABLE_COLUMNS, RELEVANCE_KEY: search_rank(terms)}
+    return sort_keys or (SortKey(RELEVANCE_KEY, True),), columns
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    ]
+
+
+def _projection(
+    fields: Optional[Sequence[str]],
+    sort_keys: Sequence[SortKey] = (),
+    sort_columns: Mapping[str, Any] = SORTABLE_COLUMNS,
+) -> Tuple[Any, ...]:
+    """
+    Colunas pedidas em `fields`, sempre com `id`, `updated_at` e as chaves de ordenação
+    (o cursor e o ETag dependem delas). Chaves calculadas, como a relevância, entram
+    como colunas rotuladas.
+    """
+    computed = tuple(
+        sort_columns[key.name].label(key.name)
+        for key in sort_keys
+        if key.name not in Automovel.__table__.columns
+    )
+    if not fields:
+        return AUTOMOVEL_COLUMNS + computed
+    wanted = set(fields) | {"id", "updated_at"} | {key.name for key in sort_keys}
+    return (
+        tuple(column for column in AUTOMOVEL_COLUMNS if column.name in wanted)
+        + computed
+    )
+
+
+def _page_query(
+    columns: Sequence[Any],
+    filters: Optional[AutomovelFilter],
+    limit: int,
+    cursor: Optional[str],
+    sort_keys: Sequence[SortKey] = (),
+    sort_columns: Mapping[str, Any] = SORTABLE_COLUMNS,
+) -> Select:
+    query = _apply_filters(select(*columns), filters)
+    if cursor:
+        query = query.filter(
+            keyset_predicate(sort_keys, cursor_values(cursor, sort_keys), sort_columns)
+        )
+    return query.order_by(*order_clauses(sort_keys, sort_columns)).limit(limit + 1)
 
 
 class AutomovelCRUD:
@@ -14,39 +183,232 @@ class AutomovelCRUD:
     async def get_all_automoveis(
         self, filters: AutomovelFilter = None
     ) -> List[AutomovelInDataBase]:
-        query = select(Automovel)
+        cache_key = query_cache.make_key("all", filters)
+        cached = query_cache.get(cache_key)
+        if not is_miss(cached):
+            return cached
 
-        if filters:
-            if filters.marca:
-                query = query.filter(
-                    Automovel.marca.ilike(f"%{filters.marca}%")
-                )
-            if filters.modelo:
-                query = query.filter(Automovel.modelo.ilike(f"%{filters.modelo}%"))
-            if filters.ano_min:
-                query = query.filter(Automovel.ano >= filters.ano_min)
-            if filters.ano_max:
-                query = query.filter(Automovel.ano <= filters.ano_max)
-            if filters.tipo_combustivel:
-                query = query.filter(
-                    Automovel.tipo_combustivel == filters.tipo_combustivel
-                )
-            if filters.quilometragem_max:
-                query = query.filter(
-                    Automovel.quilometragem <= filters.quilometragem_max
-                )
-            if filters.numero_portas:
-                query = query.filter(Automovel.numero_portas == filters.numero_portas)
-            if filters.placa_parcial:
-                query = query.filter(
-                    Automovel.placa.ilike(f"%{filters.placa_parcial}%")
-                )
-            if filters.codigo_fipe:
-                query = query.filter(Automovel.codigo_fipe == filters.codigo_fipe)
+        query = _apply_filters(select(*AUTOMOVEL_COLUMNS), filters)
+        result = await self.db_session.execute(query)
+        automoveis = AUTOMOVEL_LIST_ADAPTER.validate_python(result.mappings().all())
+        query_cache.set(cache_key, automoveis)
+        return automoveis
+
+    async def fetch_automoveis_rows(
+        self,
+        filters: AutomovelFilter = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        order_by: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Paginação por keyset: a página seguinte começa logo depois das chaves de ordenação
+        (mais o `id` como desempate) da última linha, usando o índice em vez de um OFFSET
+        que percorre as linhas puladas. Sem `order_by`, ordena só por `id`.
+        Busca `limit + 1` linhas para saber se existe uma próxima página.
+
+        Retorna as linhas cruas do banco (dicionários de colunas), sem passar pelo ORM nem
+        pelo Pydantic: os dados já respeitam as restrições do schema ao serem gravados,
+        então quem só vai serializar a resposta não precisa validá-los de novo.
+        Com `fields`, só essas colunas (mais `id` e `updated_at`) são lidas do banco.
+        Em buscas `q` ordenadas por relevância, cada linha traz também `relevancia`.
+        """
+        sort_keys, sort_columns = _sort_plan(filters, order_by)
+        cache_key = query_cache.make_key(
+            "rows",
+            filters,
+            limit=limit,
+            cursor=cursor,
+            fields=sorted(fields) if fields else None,
+            order_by=order_by,
+        )
+        cached = query_cache.get(cache_key)
+        if not is_miss(cached):
+            return cached
+
+        query = _page_query(
+            _projection(fields, sort_keys, sort_columns),
+            filters,
+            limit,
+            cursor,
+            sort_keys,
+            sort_columns,
+        )
+        result = await self.db_session.execute(query)
+        rows = [dict(row) for row in result.mappings()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cursor_for(rows[-1], sort_keys)
+        query_cache.set(cache_key, (rows, next_cursor))
+        return rows, next_cursor
+
+    async def fetch_automoveis_versions(
+        self,
+        filters: AutomovelFilter = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+    ) -> Tuple[List[Tuple[int, Optional[datetime]]], bool]:
+        """
+        Mesma página de `fetch_automoveis_rows`, mas lendo apenas `(id, updated_at)`.
+        Basta para calcular o ETag da página sem trazer as demais colunas.
+        """
+        sort_keys, sort_columns = _sort_plan(filters, order_by)
+        query = _page_query(
+            (Automovel.id, Automovel.updated_at),
+            filters,
+            limit,
+            cursor,
+            sort_keys,
+            sort_columns,
+        )
+        result = await self.db_session.execute(query)
+        versions = [tuple(row) for row in result]
+        return versions[:limit], len(versions) > limit
+
+    async def get_automoveis_page(
+        self,
+        filters: AutomovelFilter = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+    ) -> AutomovelPage:
+        rows, next_cursor = await self.fetch_automoveis_rows(
+            filters=filters, limit=limit, cursor=cursor, order_by=order_by
+        )
+        return AutomovelPage(
+            items=AUTOMOVEL_LIST_ADAPTER.validate_python(rows), next_cursor=next_cursor
+        )
+
+    async def stream_automoveis(
+        self, filters: AutomovelFilter = None, chunk_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Percorre os automóveis filtrados com um cursor no servidor (`stream` + `yield_per`),
+        entregando blocos de `chunk_size` linhas como dicionários. Nenhum bloco anterior é
+        mantido em memória, então o consumo fica constante independente do total de linhas.
+        """
+        query = (
+            _apply_filters(select(*AUTOMOVEL_COLUMNS), filters)
+            .order_by(Automovel.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.db_session.stream(query)
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+    async def get_facets(
+        self, filters: AutomovelFilter = None, ano_bucket: int = 5
+    ) -> AutomovelFacets:
+        """
+        Contagens por marca, combustível, portas e faixa de ano, mais min/max de
+        quilometragem, em uma única consulta: um UNION ALL de GROUP BYs sobre a mesma
+        CTE filtrada (portável entre PostgreSQL e SQLite, que não tem GROUPING SETS).
+        """
+        cache_key = query_cache.make_key("facets", filters, ano_bucket=ano_bucket)
+        cached = query_cache.get(cache_key)
+        if not is_miss(cached):
+            return cached
+
+        filtrados = _apply_filters(
+            select(
+                Automovel.marca,
+                Automovel.tipo_combustivel,
+                Automovel.numero_portas,
+                Automovel.ano,
+                Automovel.quilometragem,
+            ),
+            filters,
+        ).cte("filtrados")
+        # Inline (e não bind param) para o PostgreSQL reconhecer a mesma expressão no GROUP BY.
+        bucket = literal_column(str(int(ano_bucket)), Integer)
+        ano_inicio = (filtrados.c.ano // bucket) * bucket
+
+        def facet(name: str, expression) -> Select:
+            return select(
+                literal(name).label("facet"),
+                cast(expression, String).label("value"),
+                func.count().label("count"),
+                cast(null(), Float).label("km_min"),
+                cast(null(), Float).label("km_max"),
+            ).group_by(expression)
 
+        query = union_all(
+            facet("marca", filtrados.c.marca),
+            facet("tipo_combustivel", filtrados.c.tipo_combustivel),
+            facet("numero_portas", filtrados.c.numero_portas),
+            facet("ano", ano_inicio),
+            select(
+                literal("total"),
+                cast(null(), String),
+                func.count(),
+                func.min(filtrados.c.quilometragem),
+                func.max(filtrados.c.quilometragem),
+            ).select_from(filtrados),
+        )
         result = await self.db_session.execute(query)
-        automoveis_orm = result.scalars().all()
-        return [AutomovelInDataBase.model_validate(auto) for auto in automoveis_orm]
+
+        facets = AutomovelFacets(total=0)
+        for facet_name, value, count, km_min, km_max in result:
+            if facet_name == "total":
+                facets.total = count
+                facets.quilometragem_min = km_min
+                facets.quilometragem_max = km_max
+                continue
+            if facet_name == "tipo_combustivel":
+                # O Enum é gravado pelo nome do membro (ex: FLEX); a API expõe o valor.
+                value = TipoCombustivel[value].value
+            elif facet_name in ("numero_portas", "ano"):
+                value = int(value)
+            getattr(facets, facet_name).append(FacetBucket(value=value, count=count))
+
+        for buckets in (facets.marca, facets.tipo_combustivel):
+            buckets.sort(key=lambda bucket: (-bucket.count, bucket.value))
+        for buckets in (facets.numero_portas, facets.ano):
+            buckets.sort(key=lambda bucket: bucket.value)
+
+        query_cache.set(cache_key, facets)
+        return facets
+
+    async def get_inventory_version(self) -> AutomovelInventoryVersion:
+        """
+        Versão do estoque derivada do próprio banco, igual em todos os processos da API:
+        inserções mudam max(id), alterações mudam max(updated_at) e remoções mudam a contagem.
+        Não passa pelo query_cache: ele é por processo e só é invalidado pelas escritas
+        do próprio processo, então os outros workers devolveriam uma versão antiga.
+        """
+        result = await self.db_session.execute(
+            select(func.count(), func.max(Automovel.id), func.max(Automovel.updated_at))
+        )
+        total, max_id, last_modified = result.one()
+        stamp = last_modified.isoformat() if last_modified else "-"
+        return AutomovelInventoryVersion(
+            version=f"{total}-{max_id or 0}-{stamp}",
+            total=total,
+            last_modified=last_modified,
+        )
+
+    async def get_automovel_version(
+        self, automovel_id: int
+    ) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Lê só `(id, updated_at)` para responder GETs condicionais sem buscar a linha inteira."""
+        result = await self.db_session.execute(
+            select(Automovel.id, Automovel.updated_at).filter(Automovel.id == automovel_id)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def fetch_automovel_row(
+        self, automovel_id: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Linha crua de um automóvel, lendo só as colunas de `fields` (mais `id` e `updated_at`)."""
+        result = await self.db_session.execute(
+            select(*_projection(fields)).filter(Automovel.id == automovel_id)
+        )
+        row = result.mappings().first()
+        return dict(row) if row else None
 
     async def get_automovel_by_id(
         self, automovel_id: int
@@ -60,31 +422,243 @@ class AutomovelCRUD:
         return None
 
     async def create_automovel(self, automovel: AutomovelBase) -> AutomovelInDataBase:
-        new_automovel_orm = Automovel(**automovel.model_dump())
-        self.db_session.add(new_automovel_orm)
+        result = await self.db_session.execute(
+            insert(Automovel)
+            .values(**automovel.model_dump())
+            .returning(*AUTOMOVEL_COLUMNS)
+        )
+        created = AutomovelInDataBase.model_validate(result.mappings().one())
         await self.db_session.commit()
-        await self.db_session.refresh(new_automovel_orm)
-        return AutomovelInDataBase.model_validate(new_automovel_orm)
+        query_cache.bump_version()
+        return created
 
     async def update_automovel(
-        self, automovel_id: int, automovel_update: AutomovelBase
+        self, automovel_id: int, automovel_update: Union[AutomovelBase, AutomovelPatch]
     ) -> Optional[AutomovelInDataBase]:
-        automovel_orm = await self.db_session.get(Automovel, automovel_id)
-        if not automovel_orm:
-            return None
+        values = automovel_update.model_dump(exclude_unset=True)
+        if not values:
+            return await self.get_automovel_by_id(automovel_id)
 
-        for key, value in automovel_update.model_dump(exclude_unset=True).items():
-            setattr(automovel_orm, key, value)
+        result = await self.db_session.execute(
+            update(Automovel)
+            .where(Automovel.id == automovel_id)
+            .values(**values)
+            .returning(*AUTOMOVEL_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.mappings().first()
+        if row is None:
+            return None
 
+        updated = AutomovelInDataBase.model_validate(row)
         await self.db_session.commit()
-        await self.db_session.refresh(automovel_orm)
-        return AutomovelInDataBase.model_validate(automovel_orm)
+        query_cache.bump_version()
+        return updated
 
     async def delete_automovel(self, automovel_id: int) -> bool:
-        automovel_to_delete = await self.db_session.get(Automovel, automovel_id)
-        if not automovel_to_delete:
+        result = await self.db_session.execute(
+            delete(Automovel)
+            .where(Automovel.id == automovel_id)
+            .returning(Automovel.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_id = result.scalar_one_or_none()
+        if deleted_id is None:
             return False
 
-        await self.db_session.delete(automovel_to_delete)
         await self.db_session.commit()
+        query_cache.bump_version()
         return True
+
+    async def count_automoveis(self, filters: Optional[AutomovelFilter] = None) -> int:
+        result = await self.db_session.execute(
+            _apply_filters(select(func.count()).select_from(Automovel), filters)
+        )
+        return result.scalar_one()
+
+    async def update_automoveis_by_filter(
+        self,
+        filters: Optional[AutomovelFilter],
+        patch: AutomovelPatch,
+        dry_run: bool = True,
+        max_affected: Optional[int] = None,
+    ) -> AutomovelBulkChange:
+        """
+        Aplica `patch` a todos os automóveis que atendem aos filtros em um único
+        `UPDATE ... WHERE`, sem carregar as linhas. Com `dry_run`, só conta.
+        """
+        values = patch.model_dump(exclude_unset=True)
+        forbidden = sorted(set(values) & set(BULK_PATCH_FORBIDDEN))
+        if forbidden:
+            raise ValueError(
+                f"Campos únicos não podem ser alterados em lote: {', '.join(forbidden)}"
+            )
+        if not values:
+            raise ValueError("Nenhum campo para alterar.")
+
+        statement = _apply_filters(update(Automovel), filters).values(**values)
+        return await self._bulk_change(filters, statement, dry_run, max_affected)
+
+    async def delete_automoveis_by_filter(
+        self,
+        filters: Optional[AutomovelFilter],
+        dry_run: bool = True,
+        max_affected: Optional[int] = None,
+    ) -> AutomovelBulkChange:
+        """Remove, em um único `DELETE ... WHERE`, os automóveis que atendem aos filtros."""
+        statement = _apply_filters(delete(Automovel), filters)
+        return await self._bulk_change(filters, statement, dry_run, max_affected)
+
+    async def _bulk_change(
+        self,
+        filters: Optional[AutomovelFilter],
+        statement,
+        dry_run: bool,
+        max_affected: Optional[int],
+    ) -> AutomovelBulkChange:
+        if statement.whereclause is None:
+            # Sem WHERE o comando atingiria o estoque inteiro; isso nunca é feito em lote.
+            # Confere o comando montado, não os filtros: `marca=` ou um `q` só com
+            # pontuação chegam preenchidos, mas não geram nenhuma condição.
+            raise ValueError("Informe ao menos um filtro para alterar ou remover em lote.")
+
+        limit = settings.BULK_MAX_AFFECTED if max_affected is None else max_affected
+        if dry_run:
+            matched = await self.count_automoveis(filters)
+            return AutomovelBulkChange(dry_run=True, matched=matched, affected=0)
+
+        # O limite é conferido pelo rowcount do próprio comando, dentro da transação:
+        # contar antes abriria uma janela em que novas linhas passariam a casar.
+        result = await self.db_session.execute(
+            statement.execution_options(synchronize_session=False)
+        )
+        affected = result.rowcount
+        if affected > limit:
+            await self.db_session.rollback()
+            raise BulkLimitExceededError(affected, limit)
+
+        await self.db_session.commit()
+        if affected:
+            query_cache.bump_version()
+        return AutomovelBulkChange(dry_run=False, matched=affected, affected=affected)
+
+    async def bulk_upsert_automoveis(
+        self, payload: List[Dict[str, Any]], batch_size: int = 1000
+    ) -> AutomovelBulkResult:
+        """
+        Cria ou atualiza automóveis em lote usando o chassi como chave.
+        Cada lote vira um único `INSERT ... ON CONFLICT (chassi) DO UPDATE ... RETURNING`
+        dentro de um savepoint. Se o lote falhar (ex: placa duplicada em outro veículo),
+        ele é reprocessado item a item para rejeitar só as linhas problemáticas.
+        """
+        results: Dict[int, AutomovelBulkItemResult] = {}
+        valid_rows: List[Tuple[int, Dict[str, Any]]] = []
+        seen_chassis: Dict[str, int] = {}
+
+        for index, item in enumerate(payload):
+            try:
+                automovel = AutomovelCreate.model_validate(item)
+            except ValidationError as e:
+                results[index] = AutomovelBulkItemResult(
+                    index=index,
+                    status=BulkItemStatus.REJECTED,
+                    chassi=item.get("chassi") if isinstance(item, dict) else None,
+                    errors=_validation_messages(e),
+                )
+                continue
+            if automovel.chassi in seen_chassis:
+                results[index] = AutomovelBulkItemResult(
+                    index=index,
+                    status=BulkItemStatus.REJECTED,
+                    chassi=automovel.chassi,
+                    errors=[
+                        f"chassi: duplicado no lote (item {seen_chassis[automovel.chassi]})"
+                    ],
+                )
+                continue
+            seen_chassis[automovel.chassi] = index
+            valid_rows.append((index, automovel.model_dump()))
+
+        for start in range(0, len(valid_rows), batch_size):
+            batch = valid_rows[start : start + batch_size]
+            try:
+                async with self.db_session.begin_nested():
+                    outcomes = await self._upsert_batch([row for _, row in batch])
+            except DBAPIError:
+                outcomes = {}
+                for index, row in batch:
+                    try:
+                        async with self.db_session.begin_nested():
+                            outcomes.update(await self._upsert_batch([row]))
+                    except DBAPIError as e:
+                        results[index] = AutomovelBulkItemResult(
+                            index=index,
+                            status=BulkItemStatus.REJECTED,
+                            chassi=row["chassi"],
+                            errors=[str(e.orig)],
+                        )
+
+            for index, row in batch:
+                if row["chassi"] in outcomes:
+                    automovel_id, created = outcomes[row["chassi"]]
+                    results[index] = AutomovelBulkItemResult(
+                        index=index,
+                        status=(
+                            BulkItemStatus.CREATED if created else BulkItemStatus.UPDATED
+                        ),
+                        id=automovel_id,
+                        chassi=row["chassi"],
+                    )
+
+        await self.db_session.commit()
+        query_cache.bump_version()
+
+        items = [results[index] for index in sorted(results)]
+        return AutomovelBulkResult(
+            created=sum(i.status == BulkItemStatus.CREATED for i in items),
+            updated=sum(i.status == BulkItemStatus.UPDATED for i in items),
+            rejected=sum(i.status == BulkItemStatus.REJECTED for i in items),
+            items=items,
+        )
+
+    async def _upsert_batch(
+        self, rows: List[Dict[str, Any]]
+    ) -> Dict[str, Tuple[int, bool]]:
+        """Executa o upsert de um lote e retorna {chassi: (id, criado)}."""
+        table = Automovel.__table__
+        dialect_name = self.db_session.bind.dialect.name
+        dialect_insert = (
+            postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        )
+
+        stmt = dialect_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.chassi],
+            set_={
+                **{
+                    column.name: stmt.excluded[column.name]
+                    for column in table.columns
+                    if column.name in rows[0] and column.name != "chassi"
+                },
+                "updated_at": utcnow(),
+            },
+        )
+
+        if dialect_name == "postgresql":
+            # xmax = 0 indica que a linha foi inserida agora e não atualizada.
+            stmt = stmt.returning(
+                table.c.id, table.c.chassi, literal_column("(xmax = 0)")
+            )
+            result = await self.db_session.execute(stmt)
+            return {chassi: (id_, created) for id_, chassi, created in result}
+
+        chassis = [row["chassi"] for row in rows]
+        existing = set(
+            (
+                await self.db_session.execute(
+                    select(table.c.chassi).where(table.c.chassi.in_(chassis))
+                )
+            ).scalars()
+        )
+        result = await self.db_session.execute(stmt.returning(table.c.id, table.c.chassi))
+        return {chassi: (id_, chassi not in existing) for id_, chassi in result}
@@ -0,0 +1,143 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+
+from app.repository.models.automovel import Automovel
+
+# Colunas aceitas em `order_by`. Cada uma tem um índice composto (coluna, id), então
+# a ordenação por uma única chave, ascendente ou descendente, é lida direto do índice.
+SORTABLE_COLUMNS = {
+    "ano": Automovel.ano,
+    "quilometragem": Automovel.quilometragem,
+    "created_at": Automovel.created_at,
+    "marca": Automovel.marca,
+}
+
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou adulterado."""
+
+
+class InvalidSortError(ValueError):
+    """Ordenação com campo fora da lista permitida."""
+
+
+class SortKey(NamedTuple):
+    name: str
+    descending: bool = False
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Serializa a posição da última linha da página em um token opaco (base64 url-safe)."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("Cursor de paginação inválido.") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Cursor de paginação inválido.")
+    return payload
+
+
+def parse_order_by(order_by: Optional[str]) -> Tuple[SortKey, ...]:
+    """Converte `-ano,quilometragem` em chaves de ordenação (prefixo `-` = descendente)."""
+    if not order_by:
+        return ()
+    keys: List[SortKey] = []
+    for raw in order_by.split(","):
+        raw = raw.strip()
+        name = raw.lstrip("-+")
+        if name not in SORTABLE_COLUMNS:
+            raise InvalidSortError(
+                f"Ordenação por '{name}' não permitida. "
+                f"Campos válidos: {', '.join(SORTABLE_COLUMNS)}."
+            )
+        if name in (key.name for key in keys):
+            raise InvalidSortError(f"Campo '{name}' repetido em order_by.")
+        keys.append(SortKey(name, raw.startswith("-")))
+    return tuple(keys)
+
+
+def sort_spec(keys: Sequence[SortKey]) -> str:
+    return ",".join(("-" if key.descending else "") + key.name for key in keys)
+
+
+def _full_order(
+    keys: Sequence[SortKey], columns: Mapping[str, ColumnElement]
+) -> List[Tuple[ColumnElement, bool]]:
+    # O id desempata na mesma direção da primeira chave, o que mantém a ordenação
+    # determinística e permite percorrer o índice (coluna, id) de trás para frente.
+    id_descending = keys[0].descending if keys else False
+    return [(columns[key.name], key.descending) for key in keys] + [
+        (Automovel.id, id_descending)
+    ]
+
+
+def order_clauses(
+    keys: Sequence[SortKey], columns: Mapping[str, ColumnElement] = SORTABLE_COLUMNS
+) -> List[ColumnElement]:
+    return [
+        column.desc() if descending else column.asc()
+        for column, descending in _full_order(keys, columns)
+    ]
+
+
+def keyset_predicate(
+    keys: Sequence[SortKey],
+    values: Sequence[Any],
+    columns: Mapping[str, ColumnElement] = SORTABLE_COLUMNS,
+) -> ColumnElement:
+    """
+    Condição "depois da última linha vista" para a ordenação `keys` + id.
+    Com todas as direções iguais vira uma comparação de tupla `(a, id) > (:a, :id)`,
+    que o banco resolve como range scan no índice; com direções mistas, expande em
+    `a > :a OR (a = :a AND b < :b) OR ...`.
+    """
+    order = _full_order(keys, columns)
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        columns = tuple_(*(column for column, _ in order))
+        bound = tuple_(*values)
+        return columns < bound if directions.pop() else columns > bound
+
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        previous_equal = [order[j][0] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*previous_equal, step))
+    return or_(*clauses)
+
+
+def cursor_for(row: Dict[str, Any], keys: Sequence[SortKey]) -> str:
+    return encode_cursor(
+        {"o": sort_spec(keys), "k": [row[key.name] for key in keys] + [row["id"]]}
+    )
+
+
+def cursor_values(cursor: str, keys: Sequence[SortKey]) -> List[Any]:
+    """Valores da última linha guardados no cursor, conferindo que a ordenação é a mesma."""
+    payload = decode_cursor(cursor)
+    values = payload.get("k")
+    if (
+        payload.get("o") != sort_spec(keys)
+        or not isinstance(values, list)
+        or len(values) != len(keys) + 1
+        or not isinstance(values[-1], int)
+    ):
+        raise InvalidCursorError("Cursor de paginação inválido para esta ordenação.")
+    try:
+        for i, key in enumerate(keys):
+            if key.name == "created_at" and values[i] is not None:
+                values[i] = datetime.fromisoformat(values[i])
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Cursor de paginação inválido.") from e
+    return values
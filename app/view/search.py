@@ -0,0 +1,79 @@
+import re
+from typing import Sequence, Tuple
+
+from sqlalchemy import Boolean, Float, String, and_, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from app.repository.models.automovel import Automovel
+
+# Colunas cobertas pela busca textual `q`. No PostgreSQL elas compõem a coluna gerada
+# `automoveis.busca` (tsvector sem acentos, com índice GIN), criada por
+# app/scripts/create_tables.py; ela fica fora do modelo porque não existe no SQLite.
+SEARCH_COLUMNS = (Automovel.marca, Automovel.modelo, Automovel.cor, Automovel.placa)
+
+
+def search_terms(q: str) -> Tuple[str, ...]:
+    """Palavras da busca, sem pontuação (o que também protege a sintaxe do tsquery)."""
+    return tuple(re.findall(r"\w+", q))
+
+
+class _SearchExpression(ColumnElement):
+    inherit_cache = True
+    _traverse_internals = [
+        ("tsquery", InternalTraversal.dp_clauseelement),
+        ("patterns", InternalTraversal.dp_clauseelement_tuple),
+    ]
+
+    def __init__(self, terms: Sequence[str]):
+        # Prefixo em cada termo e todos obrigatórios: "toyo cor" -> "toyo:* & cor:*".
+        self.tsquery = literal(" & ".join(f"{term}:*" for term in terms), String)
+        self.patterns = tuple(literal(f"%{term}%", String) for term in terms)
+
+
+class search_match(_SearchExpression):
+    """Condição da busca `q`: tsvector + GIN no PostgreSQL, ilike por termo nos demais bancos."""
+
+    type = Boolean()
+    inherit_cache = True
+
+
+class search_rank(_SearchExpression):
+    """Relevância da busca `q` (ts_rank no PostgreSQL; constante nos demais bancos)."""
+
+    type = Float()
+    inherit_cache = True
+
+
+def _tsquery_sql(element: _SearchExpression, compiler, **kw) -> str:
+    return (
+        f"to_tsquery('simple', f_unaccent({compiler.process(element.tsquery, **kw)}))"
+    )
+
+
+@compiles(search_match, "postgresql")
+def _search_match_postgresql(element, compiler, **kw):
+    return f"(automoveis.busca @@ {_tsquery_sql(element, compiler, **kw)})"
+
+
+@compiles(search_match)
+def _search_match_default(element, compiler, **kw):
+    condition = and_(
+        *(
+            or_(*(column.ilike(pattern) for column in SEARCH_COLUMNS))
+            for pattern in element.patterns
+        )
+    )
+    return f"({compiler.process(condition, **kw)})"
+
+
+@compiles(search_rank, "postgresql")
+def _search_rank_postgresql(element, compiler, **kw):
+    # float8 para que o valor guardado no cursor compare exatamente com o recalculado.
+    return f"CAST(ts_rank(automoveis.busca, {_tsquery_sql(element, compiler, **kw)}) AS FLOAT)"
+
+
+@compiles(search_rank)
+def _search_rank_default(element, compiler, **kw):
+    return "0.0"
@@ -4,8 +4,7 @@ import sys
 
 import pytest
 import pytest_asyncio
-from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
-                                    create_async_engine)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -15,8 +14,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from fastapi.testclient import TestClient
 
+from app.core.instrumentation import instrument_engine
 from app.main import app
-from app.repository.connection import Base, get_db_session
+from app.repository.connection import Base, get_db_session, get_read_session
 from app.repository.models.automovel import Automovel
 from app.schemas.automovel_schemas import AutomovelCreate, TipoCombustivel
 from app.view.automovel_crud import AutomovelCRUD
@@ -27,6 +27,7 @@ async def test_engine_fixture():
     engine = create_async_engine(
         settings.DATABASE_URL_TEST, echo=False, poolclass=StaticPool
     )
+    instrument_engine(engine)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
@@ -67,6 +68,7 @@ def test_client_fixture(override_get_db_session):
         yield override_get_db_session
 
     app.dependency_overrides[get_db_session] = _get_test_db  # <--- Alteração aqui
+    app.dependency_overrides[get_read_session] = _get_test_db
     with TestClient(app) as client:
         yield client
     app.dependency_overrides = {}
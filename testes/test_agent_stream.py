@@ -0,0 +1,163 @@
+import pytest
+
+from app.cli.agent_stream import AgentEvent, stream_agent_events
+from app.cli.agent_view import AgentTurnView
+from app.cli.answer_cache import AnswerCache
+
+
+class _FakeExecutor:
+    """Devolve sempre a mesma sequência de eventos de `astream_events`."""
+
+    def __init__(self, events):
+        self.events = events
+        self.calls = 0
+
+    async def astream_events(self, inputs, version):
+        self.calls += 1
+        for event in self.events:
+            yield event
+
+
+class _FakeAPIClient:
+    def __init__(self, version="v1"):
+        self.version = version
+
+    async def get_inventory_version(self):
+        return self.version
+
+
+def _final_answer_events(answer):
+    return [
+        {
+            "event": "on_chain_end",
+            "name": "RunnableSequence",
+            "parent_ids": ["executor"],
+            "data": {"output": {"output": "saída de um passo interno"}},
+        },
+        {
+            "event": "on_chain_end",
+            "name": "AgentExecutor",
+            "parent_ids": [],
+            "data": {"output": {"output": answer}},
+        },
+    ]
+
+
+async def _answer(executor, question, api_client, answer_cache):
+    return [
+        event
+        async for event in stream_agent_events(
+            executor, question, api_client, answer_cache
+        )
+        if event.kind == "answer"
+    ][-1]
+
+
+@pytest.mark.asyncio
+async def test_stream_agent_reuses_cached_answer(tmp_path):
+    executor = _FakeExecutor(_final_answer_events("Temos 2 elétricos."))
+    api_client = _FakeAPIClient()
+    answer_cache = AnswerCache(str(tmp_path / "respostas.sqlite3"))
+    assert len(answer_cache) == 0  # vazio, mas ainda assim precisa ser usado
+
+    first = await _answer(executor, "Quais carros elétricos?", api_client, answer_cache)
+    second = await _answer(executor, "quais carros eletricos", api_client, answer_cache)
+
+    assert (first.text, first.cached) == ("Temos 2 elétricos.", False)
+    assert (second.text, second.cached) == ("Temos 2 elétricos.", True)
+    assert executor.calls == 1
+    assert (answer_cache.hits, answer_cache.misses) == (1, 1)
+
+    # Outra versão do estoque roda o agente de novo.
+    api_client.version = "v2"
+    await _answer(executor, "Quais carros elétricos?", api_client, answer_cache)
+    assert executor.calls == 2
+    answer_cache.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_agent_events_drive_the_turn_view():
+    events = [
+        {"event": "on_chat_model_stream", "data": {"chunk": "Thought: vou buscar.\n"}},
+        {
+            "event": "on_chat_model_stream",
+            "data": {"chunk": [{"text": "Action: "}, "x"]},
+        },
+        {"event": "on_chat_model_stream", "data": {"chunk": ""}},
+        {
+            "event": "on_tool_start",
+            "name": "consultar_automoveis",
+            "data": {"input": '{"tipo_combustivel": "Elétrico"}'},
+        },
+        {
+            "event": "on_tool_end",
+            "name": "consultar_automoveis",
+            "data": {"output": "Resultados encontrados:\nID: 1, Marca: BYD"},
+        },
+        {"event": "on_chat_model_stream", "data": {"chunk": "Thought: achei.\nFinal "}},
+        {"event": "on_chat_model_stream", "data": {"chunk": "Answer: Temos"}},
+        {"event": "on_chat_model_stream", "data": {"chunk": " 1 elétrico."}},
+        *_final_answer_events("Temos 1 elétrico."),
+    ]
+    view = AgentTurnView()
+    partial_answers = []
+    streamed = []
+    async for event in stream_agent_events(
+        _FakeExecutor(events), "Tem elétrico?", _FakeAPIClient(), None
+    ):
+        streamed.append(event)
+        view.apply(event)
+        partial_answers.append(view.partial_answer())
+
+    assert [event.kind for event in streamed] == [
+        "token",
+        "token",
+        "tool_start",
+        "tool_end",
+        "token",
+        "token",
+        "token",
+        "answer",
+    ]
+    # Só o on_chain_end sem pai (o AgentExecutor) vira a resposta final.
+    assert streamed[-1] == AgentEvent("answer", "Temos 1 elétrico.")
+    # O marcador chega dividido entre tokens; antes dele nada aparece como resposta.
+    assert partial_answers[4:7] == ["", "Temos", "Temos 1 elétrico."]
+    assert view.steps.plain == (
+        "Thought: vou buscar.\nAction: x\n"
+        '→ consultar_automoveis: {"tipo_combustivel": "Elétrico"}\n'
+        "← Resultados encontrados:\n"
+    )
+    assert view.answer == "Temos 1 elétrico."
+
+
+@pytest.mark.asyncio
+async def test_stream_agent_events_short_circuits_on_cached_answer(tmp_path):
+    answer_cache = AnswerCache(str(tmp_path / "respostas.sqlite3"))
+    answer_cache.set("Tem elétrico?", "v1", "Temos 1 elétrico.")
+    executor = _FakeExecutor([])  # sem on_chain_end: rodar o executor seria um erro
+    view = AgentTurnView()
+
+    streamed = [
+        event
+        async for event in stream_agent_events(
+            executor, "tem eletrico", _FakeAPIClient(), answer_cache
+        )
+    ]
+    for event in streamed:
+        view.apply(event)
+
+    assert streamed == [AgentEvent("answer", "Temos 1 elétrico.", cached=True)]
+    assert executor.calls == 0
+    assert (view.answer, view.steps.plain, view.generation) == (
+        "Temos 1 elétrico.",
+        "",
+        "",
+    )
+    answer_cache.close()
+
+    with pytest.raises(RuntimeError):
+        async for _ in stream_agent_events(
+            executor, "Tem elétrico?", _FakeAPIClient(), None
+        ):
+            pass
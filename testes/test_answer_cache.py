@@ -0,0 +1,39 @@
+import time
+
+from app.cli.answer_cache import AnswerCache, normalize_question
+
+
+def test_normalize_question():
+    assert normalize_question("  Quais carros  ELÉTRICOS\nvocês têm? ") == (
+        "quais carros eletricos voces tem"
+    )
+
+
+def test_answer_cache_hit_invalidation_and_limits(tmp_path):
+    cache = AnswerCache(str(tmp_path / "respostas.sqlite3"), ttl=60, maxsize=2)
+
+    cache.set("Quais carros elétricos vocês têm?", "v1", "Temos 2 elétricos.")
+    assert cache.get("quais carros eletricos voces tem", "v1") == "Temos 2 elétricos."
+    # Outra versão do estoque não encontra a resposta antiga...
+    assert cache.get("quais carros eletricos voces tem", "v2") is None
+    # ...e a primeira escrita na versão nova remove as antigas.
+    cache.set("Tem Toyota?", "v2", "Sim.")
+    assert len(cache) == 1
+
+    cache.set("Tem Honda?", "v2", "Não.")
+    cache.get("Tem Toyota?", "v2")
+    cache.set("Tem Fiat?", "v2", "Sim.")
+    assert len(cache) == 2
+    assert cache.get("Tem Honda?", "v2") is None  # a menos usada saiu (LRU)
+    assert cache.get("Tem Toyota?", "v2") == "Sim."
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get("Tem Toyota?", "v2") is None
+    assert (cache.hits, cache.misses) == (3, 3)
+    cache.close()
+
+    # Persistente: um novo processo reaproveita o arquivo.
+    reopened = AnswerCache(str(tmp_path / "respostas.sqlite3"), ttl=60)
+    assert reopened.get("tem fiat", "v2") == "Sim."
+    reopened.close()
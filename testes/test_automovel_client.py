@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cli import automovel_client
+from app.cli.automovel_client import (
+    ASGIBackend,
+    AutomovelAPIClient,
+    AutomovelPage,
+    InProcessBackend,
+    create_backend,
+)
+from app.main import app
+from app.repository.connection import get_db_session, get_read_session
+from app.schemas.automovel_schemas import AutomovelCreate, TipoCombustivel
+
+
+@pytest.mark.asyncio
+async def test_agent_backends_return_the_same_answer(
+    test_engine, automovel_crud, monkeypatch
+):
+    for i in range(7):
+        await automovel_crud.create_automovel(
+            AutomovelCreate(
+                marca="Transporte",
+                modelo=f"Modelo {i}",
+                ano=2020,
+                cor="Azul",
+                tipo_combustivel=TipoCombustivel.HIBRIDO,
+                quilometragem=100.0 * i,
+                numero_portas=4,
+                placa=None,
+                chassi=f"TRANSPORTE000000{i}",
+                codigo_fipe="001234-5",
+            )
+        )
+    session_factory = async_sessionmaker(
+        test_engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+    async def _get_test_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = _get_test_db
+    app.dependency_overrides[get_read_session] = _get_test_db
+    answers = []
+    try:
+        for backend in (InProcessBackend(session_factory), ASGIBackend(app)):
+            client = AutomovelAPIClient(backend)
+            answers.append(await client.get_automoveis({"marca": "Transporte"}))
+            answers.append(await client.get_automoveis({"marca": "Nenhuma"}))
+            answers.append(await client.get_automoveis({"tipo_combustivel": "Carvão"}))
+            with monkeypatch.context() as patched:
+                # Página cheia com cursor: o total real não é conhecido, só o mínimo.
+                patched.setattr(automovel_client, "RESULT_LIMIT", 6)
+                answers.append(
+                    await client.get_automoveis(
+                        {"marca": "Transporte", "ano_min": 2020}
+                    )
+                )
+            await client.aclose()
+    finally:
+        app.dependency_overrides = {}
+
+    in_process, asgi = answers[:4], answers[4:]
+    assert in_process[:2] == asgi[:2]
+    assert in_process[3] == asgi[3]
+    assert in_process[3].endswith("...e mais de 1 resultados.")
+    assert "Combustível: Híbrido" in in_process[0]
+    assert in_process[0].endswith("...e mais 2 resultados.")
+    assert in_process[1] == "Nenhum automóvel encontrado com os filtros fornecidos."
+    assert in_process[2].startswith("Filtros inválidos")
+    assert asgi[2].startswith("Erro na resposta da API 422")
+
+    with pytest.raises(ValueError):
+        create_backend("grpc")
+
+
+class _SlowBackend:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def fetch(self, params, limit):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if params.get("marca") == "Falha":
+            raise RuntimeError("backend fora do ar")
+        return AutomovelPage([], False)
+
+    async def inventory_version(self):
+        return "0-0-0"
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_get_automoveis_batch_bounds_concurrency():
+    backend = _SlowBackend()
+    client = AutomovelAPIClient(backend, cache_ttl=0)
+    filter_sets = [{"marca": f"M{i}"} for i in range(9)] + [{"marca": "Falha"}]
+
+    results = await client.get_automoveis_batch(filter_sets, concurrency=3)
+
+    assert backend.peak == 3
+    assert len(results) == 10
+    assert results[0] == "Nenhum automóvel encontrado com os filtros fornecidos."
+    assert results[-1].startswith("Erro inesperado")
+
+
+@pytest.mark.asyncio
+async def test_get_automoveis_cache_and_single_flight():
+    backend = _SlowBackend()
+    client = AutomovelAPIClient(backend, cache_ttl=60)
+
+    results = await asyncio.gather(
+        *(client.get_automoveis({"marca": "Fiat", "ano_min": None}) for _ in range(5))
+    )
+    assert len(set(results)) == 1
+    assert backend.calls == 1
+    await client.get_automoveis({"marca": "Fiat"})
+    assert backend.calls == 1
+
+    await client.get_automoveis({"marca": "Falha"})
+    await client.get_automoveis({"marca": "Falha"})
+    assert backend.calls == 3  # erros não ficam em cache
+
+    stats = client.cache_stats()
+    assert (stats.lookups, stats.hits, stats.coalesced, stats.misses) == (8, 1, 4, 3)
+    assert stats.saved == 5
+    assert stats.size == 1
+
+    client.cache_ttl = 0.001
+    client._results.clear()
+    await client.get_automoveis({"marca": "Fiat"})
+    await asyncio.sleep(0.01)
+    await client.get_automoveis({"marca": "Fiat"})
+    assert backend.calls == 5  # expirou pelo TTL
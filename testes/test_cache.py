@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from app.core.cache import LRUTTLCache, QueryCache, is_miss
+from app.schemas.automovel_schemas import AutomovelFilter, TipoCombustivel
+
+
+def test_lru_ttl_cache_eviction_and_expiration(monkeypatch):
+    cache = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # "b" é o menos usado recentemente
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (
+        2,
+        2,
+        1,
+        1,
+    )
+
+
+def test_query_cache_key_is_canonical_and_versioned():
+    query_cache = QueryCache(LRUTTLCache())
+    key = query_cache.make_key(
+        "rows", AutomovelFilter(ano_min=2020, tipo_combustivel=TipoCombustivel.FLEX)
+    )
+    same_key = query_cache.make_key(
+        "rows",
+        AutomovelFilter(tipo_combustivel="Flex", ano_min=2020, marca=None),
+        cursor=None,
+    )
+    assert key == same_key
+
+    query_cache.set(key, ["cached"])
+    assert query_cache.get(key) == ["cached"]
+
+    query_cache.bump_version()
+    new_key = query_cache.make_key(
+        "rows", AutomovelFilter(ano_min=2020, tipo_combustivel="Flex")
+    )
+    assert is_miss(query_cache.get(new_key))
+
+
+@pytest.mark.asyncio
+async def test_list_endpoint_cache_invalidated_on_write(test_client):
+    automovel = {
+        "marca": "Cacheada",
+        "modelo": "LRU",
+        "ano": 2023,
+        "cor": "Azul",
+        "tipo_combustivel": "Híbrido",
+        "quilometragem": 10.0,
+        "numero_portas": 4,
+        "placa": "CAC1H23",
+        "chassi": "CACHE000000000001",
+        "codigo_fipe": "001008-9",
+    }
+    assert test_client.get("/automoveis/?marca=Cacheada").json() == []
+    hits_before = test_client.get("/cache/stats").json()["hits"]
+    assert test_client.get("/automoveis/?marca=Cacheada").json() == []
+    assert test_client.get("/cache/stats").json()["hits"] == hits_before + 1
+
+    test_client.post("/automoveis/", json=automovel)
+    assert len(test_client.get("/automoveis/?marca=Cacheada").json()) == 1
@@ -0,0 +1,131 @@
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app.repository import connection
+from app.repository.connection import (
+    READ_YOUR_WRITES_COOKIE,
+    ReplicaHealth,
+    get_read_session,
+)
+
+
+def _request(cookie: str = None) -> Request:
+    headers = (
+        [(b"cookie", f"{READ_YOUR_WRITES_COOKIE}={cookie}".encode())] if cookie else []
+    )
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest_asyncio.fixture(name="broken_replica")
+async def broken_replica_fixture(monkeypatch):
+    """
+    Réplica cujo arquivo não pode ser aberto: toda conexão falha. O primário também é
+    trocado por um SQLite descartável, para o teste nunca abrir o banco de DATABASE_URL.
+    """
+    primary = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monkeypatch.setattr(connection, "engine", primary)
+    monkeypatch.setattr(
+        connection,
+        "AsyncSessionLocal",
+        async_sessionmaker(bind=primary, class_=AsyncSession),
+    )
+    replica = create_async_engine(
+        "sqlite+aiosqlite:////diretorio/inexistente/replica.db"
+    )
+    monkeypatch.setattr(connection, "read_engine", replica)
+    monkeypatch.setattr(
+        connection,
+        "AsyncReadSessionLocal",
+        async_sessionmaker(bind=replica, class_=AsyncSession),
+    )
+    monkeypatch.setattr(connection, "replica_health", ReplicaHealth(retry_after=60))
+    yield replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def _bind_of(request: Request):
+    sessions = get_read_session(request)
+    session = await sessions.__anext__()
+    bind = session.bind
+    await sessions.aclose()
+    return bind
+
+
+@pytest.mark.asyncio
+async def test_read_session_falls_back_to_primary(broken_replica):
+    assert await _bind_of(_request()) is connection.engine
+    assert connection.replica_health.failures == 1
+    assert not connection.replica_health.available()
+
+    # Enquanto a réplica está marcada como indisponível, nem tenta conectar nela.
+    assert await _bind_of(_request()) is connection.engine
+    assert connection.replica_health.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_read_session_pinned_to_primary_after_write(broken_replica):
+    pinned_until = f"{time.time() + 30:.3f}"
+    assert await _bind_of(_request(pinned_until)) is connection.engine
+    assert connection.replica_health.failures == 0
+
+    expired = f"{time.time() - 1:.3f}"
+    assert await _bind_of(_request(expired)) is connection.engine
+    assert connection.replica_health.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_write_sets_read_your_writes_cookie(test_client, monkeypatch):
+    response = test_client.delete("/automoveis/999999")
+    assert response.status_code == 404
+    assert READ_YOUR_WRITES_COOKIE not in response.cookies
+
+    monkeypatch.setattr(connection, "read_engine", object())
+    response = test_client.post(
+        "/automoveis/",
+        json={
+            "marca": "Replica",
+            "modelo": "Cookie",
+            "ano": 2022,
+            "cor": "Preto",
+            "tipo_combustivel": "Flex",
+            "quilometragem": 10.0,
+            "numero_portas": 4,
+            "placa": "RYW1A23",
+            "chassi": "READYOURWRITES001",
+            "codigo_fipe": "001002-3",
+        },
+    )
+    assert response.status_code == 201
+    assert float(response.cookies[READ_YOUR_WRITES_COOKIE]) > time.time()
+
+
+@pytest.mark.asyncio
+async def test_pool_wait_is_recorded_at_the_lazy_checkout():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monitor = connection.PoolMonitor(engine)
+    session_factory = async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=connection.PoolWaitSession,
+        info={"pool_monitor": monitor},
+    )
+    try:
+        async with session_factory():
+            pass  # sessão sem consultas (ex: resposta do cache): nenhum checkout
+        assert (monitor.checkouts, monitor.checkout_wait_count) == (0, 0)
+
+        async with session_factory() as session:
+            await session.execute(text("SELECT 1"))
+            await session.execute(text("SELECT 2"))  # mesma conexão, sem nova espera
+            await session.commit()
+            await session.execute(text("SELECT 3"))
+        assert (monitor.checkouts, monitor.checkout_wait_count) == (2, 2)
+        assert session.info.get("checkout_started") is None
+    finally:
+        await engine.dispose()
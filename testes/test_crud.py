@@ -1,7 +1,27 @@
+from datetime import datetime
+
 import pytest
+from sqlalchemy import text
 
-from app.schemas.automovel_schemas import (AutomovelCreate, TipoCombustivel, AutomovelBase)
-from app.view.automovel_crud import AutomovelCRUD
+from app.schemas.automovel_schemas import (
+    AutomovelBase,
+    AutomovelCreate,
+    AutomovelFilter,
+    AutomovelPatch,
+    TipoCombustivel,
+)
+from app.view.automovel_crud import (
+    AUTOMOVEL_COLUMNS,
+    AutomovelCRUD,
+    BulkLimitExceededError,
+    _page_query,
+)
+from app.view.pagination import (
+    InvalidCursorError,
+    InvalidSortError,
+    cursor_for,
+    parse_order_by,
+)
 
 
 @pytest.mark.asyncio
@@ -142,3 +162,275 @@ async def test_delete_automovel(
 
     not_found_delete = await automovel_crud.delete_automovel(9999)
     assert not_found_delete is False
+
+
+@pytest.mark.asyncio
+async def test_get_automoveis_page_keyset(automovel_crud: AutomovelCRUD):
+    for i in range(5):
+        await automovel_crud.create_automovel(
+            AutomovelCreate(
+                marca="Paginada",
+                modelo=f"Modelo {i}",
+                ano=2020 + i,
+                cor="Branco",
+                tipo_combustivel=TipoCombustivel.FLEX,
+                quilometragem=1000.0 * i,
+                numero_portas=4,
+                placa=f"PAG{i}A1{i}",
+                chassi=f"PAGINACAO0000000{i}",
+                codigo_fipe="001234-5",
+            )
+        )
+    filters = AutomovelFilter(marca="Paginada")
+
+    first_page = await automovel_crud.get_automoveis_page(filters=filters, limit=2)
+    assert len(first_page.items) == 2
+    assert first_page.next_cursor is not None
+
+    second_page = await automovel_crud.get_automoveis_page(
+        filters=filters, limit=2, cursor=first_page.next_cursor
+    )
+    last_page = await automovel_crud.get_automoveis_page(
+        filters=filters, limit=2, cursor=second_page.next_cursor
+    )
+    assert len(last_page.items) == 1
+    assert last_page.next_cursor is None
+
+    ids = [a.id for page in (first_page, second_page, last_page) for a in page.items]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+
+    with pytest.raises(InvalidCursorError):
+        await automovel_crud.get_automoveis_page(filters=filters, cursor="nao-e-cursor")
+
+
+@pytest.mark.asyncio
+async def test_get_facets(automovel_crud: AutomovelCRUD):
+    for i, (combustivel, ano, portas) in enumerate(
+        [
+            (TipoCombustivel.FLEX, 2018, 4),
+            (TipoCombustivel.FLEX, 2021, 2),
+            (TipoCombustivel.ELETRICO, 2022, 4),
+        ]
+    ):
+        await automovel_crud.create_automovel(
+            AutomovelCreate(
+                marca="Facetada",
+                modelo=f"Modelo {i}",
+                ano=ano,
+                cor="Cinza",
+                tipo_combustivel=combustivel,
+                quilometragem=10000.0 * (i + 1),
+                numero_portas=portas,
+                placa=f"FAC{i}A1{i}",
+                chassi=f"FACETAS000000000{i}",
+                codigo_fipe="001234-5",
+            )
+        )
+
+    facets = await automovel_crud.get_facets(AutomovelFilter(marca="Facetada"))
+
+    assert facets.total == 3
+    assert [(b.value, b.count) for b in facets.marca] == [("Facetada", 3)]
+    assert [(b.value, b.count) for b in facets.tipo_combustivel] == [
+        ("Flex", 2),
+        ("Elétrico", 1),
+    ]
+    assert [(b.value, b.count) for b in facets.numero_portas] == [(2, 1), (4, 2)]
+    assert [(b.value, b.count) for b in facets.ano] == [(2015, 1), (2020, 2)]
+    assert (facets.quilometragem_min, facets.quilometragem_max) == (10000.0, 30000.0)
+
+
+@pytest.mark.asyncio
+async def test_get_automoveis_page_order_by(automovel_crud: AutomovelCRUD):
+    specs = [(2019, 500.0), (2022, 100.0), (2019, 300.0), (2021, 100.0), (2022, 900.0)]
+    for i, (ano, km) in enumerate(specs):
+        await automovel_crud.create_automovel(
+            AutomovelCreate(
+                marca="Ordenada",
+                modelo=f"Modelo {i}",
+                ano=ano,
+                cor="Preto",
+                tipo_combustivel=TipoCombustivel.DIESEL,
+                quilometragem=km,
+                numero_portas=4,
+                placa=f"ORD{i}B1{i}",
+                chassi=f"ORDENACAO0000000{i}",
+                codigo_fipe="001234-5",
+            )
+        )
+    filters = AutomovelFilter(marca="Ordenada")
+
+    for order_by, expected in [
+        ("-ano,quilometragem", [(2022, 100.0), (2022, 900.0), (2021, 100.0), (2019, 300.0), (2019, 500.0)]),
+        ("quilometragem,-ano", [(2022, 100.0), (2021, 100.0), (2019, 300.0), (2019, 500.0), (2022, 900.0)]),
+    ]:
+        seen, cursor = [], None
+        while True:
+            page = await automovel_crud.get_automoveis_page(
+                filters=filters, limit=2, cursor=cursor, order_by=order_by
+            )
+            seen += [(a.ano, a.quilometragem) for a in page.items]
+            cursor = page.next_cursor
+            if not cursor:
+                break
+        assert seen == expected
+
+    with pytest.raises(InvalidSortError):
+        await automovel_crud.get_automoveis_page(filters=filters, order_by="cor")
+
+    first_page = await automovel_crud.get_automoveis_page(
+        filters=filters, limit=2, order_by="ano"
+    )
+    with pytest.raises(InvalidCursorError):
+        await automovel_crud.get_automoveis_page(
+            filters=filters, cursor=first_page.next_cursor, order_by="-ano"
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "order_by",
+    [None, "ano", "-ano", "quilometragem", "-quilometragem", "created_at", "-created_at", "marca", "-marca"],
+)
+async def test_order_by_is_index_backed(test_db_session, order_by):
+    """Falha se a ordenação de uma única chave precisar de sort em memória (USE TEMP B-TREE)."""
+    sort_keys = parse_order_by(order_by)
+    cursor = cursor_for(
+        {"id": 10, "ano": 2020, "quilometragem": 1.0, "marca": "M",
+         "created_at": datetime(2024, 1, 1)},
+        sort_keys,
+    )
+    for page_cursor in (None, cursor):
+        query = _page_query(AUTOMOVEL_COLUMNS, None, 100, page_cursor, sort_keys)
+        compiled = query.compile(
+            dialect=test_db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+        result = await test_db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+        plan = " | ".join(str(row[-1]) for row in result)
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_get_automoveis_page_full_text_search(automovel_crud: AutomovelCRUD):
+    for i, (marca, modelo, cor) in enumerate(
+        [("Toyota", "Corolla", "Prata"), ("Toyota", "Etios", "Preto"),
+         ("Honda", "Civic", "Prata"), ("Toyota", "Hilux", "Prata")]
+    ):
+        await automovel_crud.create_automovel(
+            AutomovelCreate(
+                marca=marca,
+                modelo=modelo,
+                ano=2020,
+                cor=cor,
+                tipo_combustivel=TipoCombustivel.FLEX,
+                quilometragem=1000.0,
+                numero_portas=4,
+                placa=f"BUS{i}C1{i}",
+                chassi=f"BUSCATEXTUAL0000{i}",
+                codigo_fipe="001234-5",
+            )
+        )
+
+    page = await automovel_crud.get_automoveis_page(
+        filters=AutomovelFilter(q="toyo, PRATA"), limit=1
+    )
+    assert len(page.items) == 1
+    assert page.next_cursor is not None
+    next_page = await automovel_crud.get_automoveis_page(
+        filters=AutomovelFilter(q="toyo, PRATA"), limit=1, cursor=page.next_cursor
+    )
+    assert {page.items[0].modelo, next_page.items[0].modelo} == {"Corolla", "Hilux"}
+    assert next_page.next_cursor is None
+
+    rows, _ = await automovel_crud.fetch_automoveis_rows(
+        filters=AutomovelFilter(q="bus2"), order_by="ano"
+    )
+    assert [row["modelo"] for row in rows] == ["Civic"]
+    assert "relevancia" not in rows[0]
+
+    all_rows, _ = await automovel_crud.fetch_automoveis_rows(
+        filters=AutomovelFilter(q="!!!", placa_parcial="BUS")
+    )
+    assert len(all_rows) == 4
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_automoveis_by_filter(automovel_crud: AutomovelCRUD):
+    for i in range(4):
+        await automovel_crud.create_automovel(
+            AutomovelCreate(
+                marca="Loteada",
+                modelo="Uno",
+                ano=2008 + i,
+                cor="Branco",
+                tipo_combustivel=TipoCombustivel.FLEX,
+                quilometragem=1000.0,
+                numero_portas=4,
+                placa=None,
+                chassi=f"LOTEFILTRO000000{i}",
+                codigo_fipe="001234-5",
+            )
+        )
+    filters = AutomovelFilter(marca="Loteada", ano_max=2010)
+    patch = AutomovelPatch(cor="Prata")
+
+    preview = await automovel_crud.update_automoveis_by_filter(filters, patch)
+    assert (preview.dry_run, preview.matched, preview.affected) == (True, 3, 0)
+
+    with pytest.raises(BulkLimitExceededError):
+        await automovel_crud.update_automoveis_by_filter(
+            filters, patch, dry_run=False, max_affected=2
+        )
+    rows, _ = await automovel_crud.fetch_automoveis_rows(
+        filters=AutomovelFilter(marca="Loteada"), fields=("cor",)
+    )
+    assert {row["cor"] for row in rows} == {"Branco"}
+
+    changed = await automovel_crud.update_automoveis_by_filter(filters, patch, dry_run=False)
+    assert (changed.dry_run, changed.affected) == (False, 3)
+    rows, _ = await automovel_crud.fetch_automoveis_rows(
+        filters=AutomovelFilter(marca="Loteada"), fields=("ano", "cor")
+    )
+    assert [row["cor"] for row in rows] == ["Prata", "Prata", "Prata", "Branco"]
+
+    with pytest.raises(ValueError):
+        await automovel_crud.update_automoveis_by_filter(
+            filters, AutomovelPatch(chassi="LOTEFILTRO0000009"), dry_run=False
+        )
+
+    for no_condition in (AutomovelFilter(), AutomovelFilter(marca=""), AutomovelFilter(q="!!")):
+        with pytest.raises(ValueError):
+            await automovel_crud.delete_automoveis_by_filter(no_condition, dry_run=False)
+        with pytest.raises(ValueError):
+            await automovel_crud.update_automoveis_by_filter(
+                no_condition, patch, dry_run=False
+            )
+    # Zero é um limite válido, não a ausência do filtro.
+    assert await automovel_crud.count_automoveis(
+        AutomovelFilter(marca="Loteada", quilometragem_max=0)
+    ) == 0
+
+    deleted = await automovel_crud.delete_automoveis_by_filter(filters, dry_run=False)
+    assert deleted.affected == 3
+    assert await automovel_crud.count_automoveis(AutomovelFilter(marca="Loteada")) == 1
+
+
+@pytest.mark.asyncio
+async def test_inventory_version_sees_writes_from_other_processes(
+    automovel_crud: AutomovelCRUD, sample_automovel_data: AutomovelCreate
+):
+    created = await automovel_crud.create_automovel(
+        sample_automovel_data.model_copy(update={"chassi": "OUTROPROCESSO0001", "placa": None})
+    )
+    before = await automovel_crud.get_inventory_version()
+
+    # Escrita de outro worker: nada invalida o query_cache deste processo.
+    await automovel_crud.db_session.execute(
+        text("DELETE FROM automoveis WHERE id = :id"), {"id": created.id}
+    )
+    await automovel_crud.db_session.commit()
+
+    after = await automovel_crud.get_inventory_version()
+    assert after.total == before.total - 1
+    assert after.version != before.version
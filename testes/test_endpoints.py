@@ -1,3 +1,7 @@
+import csv
+import io
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -221,3 +225,361 @@ async def test_delete_automovel_endpoint(test_client: TestClient):
 
     response_get = test_client.get(f"/automoveis/{automovel_id}")
     assert response_get.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_automoveis_pagination_endpoint(test_client: TestClient):
+    """Testa a paginação por cursor do endpoint GET /automoveis/"""
+    for i in range(3):
+        test_client.post(
+            "/automoveis/",
+            json={
+                "marca": "Cursor",
+                "modelo": f"Modelo {i}",
+                "ano": 2021,
+                "cor": "Preto",
+                "tipo_combustivel": "Flex",
+                "quilometragem": 100.0,
+                "numero_portas": 4,
+                "placa": f"CUR{i}B2{i}",
+                "chassi": f"CURSOR0000000000{i}",
+                "codigo_fipe": "001005-6",
+            },
+        )
+
+    response = test_client.get("/automoveis/?marca=Cursor&limit=2")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.json()[0]["tipo_combustivel"] == "Flex"
+    assert "created_at" in response.json()[0]
+    next_cursor = response.headers["X-Next-Cursor"]
+
+    response = test_client.get(
+        f"/automoveis/?marca=Cursor&limit=2&cursor={next_cursor}"
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" not in response.headers
+
+    assert test_client.get("/automoveis/?cursor=invalido").status_code == 400
+    assert test_client.get("/automoveis/?order_by=cor").status_code == 400
+
+    response = test_client.get("/automoveis/?marca=Cursor&order_by=-modelo")
+    assert response.status_code == 400
+    response = test_client.get("/automoveis/?marca=Cursor&order_by=-marca&limit=2")
+    assert response.status_code == 200
+    assert [a["modelo"] for a in response.json()] == ["Modelo 2", "Modelo 1"]
+    assert test_client.get("/automoveis/?limit=100000").status_code == 422
+
+    response = test_client.get("/automoveis/?q=cursor%20modelo%201&fields=id,modelo")
+    assert response.status_code == 200
+    assert response.json() == [{"id": response.json()[0]["id"], "modelo": "Modelo 1"}]
+
+
+@pytest.mark.asyncio
+async def test_export_automoveis_endpoint(test_client: TestClient):
+    """Testa o endpoint GET /automoveis/export nos formatos NDJSON e CSV."""
+    test_client.post(
+        "/automoveis/",
+        json={
+            "marca": "Exportada",
+            "modelo": "Stream",
+            "ano": 2022,
+            "cor": "Prata",
+            "tipo_combustivel": "Elétrico",
+            "quilometragem": 1200.0,
+            "numero_portas": 4,
+            "placa": "EXP1S22",
+            "chassi": "EXPORT00000000001",
+            "codigo_fipe": "001006-7",
+        },
+    )
+
+    response = test_client.get("/automoveis/export?format=ndjson&marca=Exportada")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["tipo_combustivel"] == "Elétrico"
+    assert lines[0]["chassi"] == "EXPORT00000000001"
+    # Datas no mesmo formato da listagem.
+    listed = test_client.get("/automoveis/?marca=Exportada").json()[0]
+    assert lines[0]["created_at"] == listed["created_at"]
+    assert "T" in lines[0]["created_at"]
+
+    response = test_client.get("/automoveis/export?format=csv&marca=Exportada")
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["modelo"] == "Stream"
+    assert rows[0]["tipo_combustivel"] == "Elétrico"
+    assert rows[0]["created_at"] == listed["created_at"]
+
+    assert test_client.get("/automoveis/export?format=xml").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_automoveis_endpoint(test_client: TestClient):
+    """Testa o endpoint POST /automoveis/bulk com itens criados, atualizados e rejeitados."""
+    base = {
+        "marca": "Lote",
+        "modelo": "Feed",
+        "ano": 2020,
+        "cor": "Branco",
+        "tipo_combustivel": "Flex",
+        "quilometragem": 1000.0,
+        "numero_portas": 4,
+        "codigo_fipe": "001007-8",
+    }
+    existing = test_client.post(
+        "/automoveis/", json={**base, "placa": "LOT1A00", "chassi": "BULK0000000000000"}
+    ).json()
+
+    payload = [
+        {**base, "placa": "LOT1A01", "chassi": "BULK0000000000001"},
+        {**base, "cor": "Preto", "placa": "LOT1A00", "chassi": "BULK0000000000000"},
+        {**base, "placa": "LOT1A02", "chassi": "curto"},
+        {**base, "placa": "LOT1A03", "chassi": "BULK0000000000001"},
+        {**base, "placa": "LOT1A00", "chassi": "BULK0000000000004"},
+        {**base, "placa": "LOT1A05", "chassi": "BULK0000000000005"},
+    ]
+    response = test_client.post("/automoveis/bulk?batch_size=4", json=payload)
+    assert response.status_code == 200
+    result = response.json()
+    statuses = [item["status"] for item in result["items"]]
+    assert statuses == [
+        "created",
+        "updated",
+        "rejected",
+        "rejected",
+        "rejected",
+        "created",
+    ]
+    assert (result["created"], result["updated"], result["rejected"]) == (2, 1, 3)
+    assert result["items"][1]["id"] == existing["id"]
+    assert result["items"][2]["errors"]
+
+    updated = test_client.get(f"/automoveis/{existing['id']}").json()
+    assert updated["cor"] == "Preto"
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_automovel_endpoint(test_client: TestClient):
+    """Testa ETag/Last-Modified e respostas 304 em GET /automoveis/{id} e na listagem."""
+    automovel_id = test_client.post(
+        "/automoveis/",
+        json={
+            "marca": "Condicional",
+            "modelo": "ETag",
+            "ano": 2021,
+            "cor": "Branco",
+            "tipo_combustivel": "Diesel",
+            "quilometragem": 500.0,
+            "numero_portas": 4,
+            "placa": "ETG1A21",
+            "chassi": "ETAG0000000000001",
+            "codigo_fipe": "001009-0",
+        },
+    ).json()["id"]
+
+    response = test_client.get(f"/automoveis/{automovel_id}")
+    etag = response.headers["ETag"]
+    assert "Last-Modified" in response.headers
+
+    response = test_client.get(
+        f"/automoveis/{automovel_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    list_response = test_client.get("/automoveis/?marca=Condicional")
+    list_etag = list_response.headers["ETag"]
+    response = test_client.get(
+        "/automoveis/?marca=Condicional", headers={"If-None-Match": list_etag}
+    )
+    assert response.status_code == 304
+
+    test_client.put(
+        f"/automoveis/{automovel_id}",
+        json={**list_response.json()[0], "cor": "Preto"},
+    )
+    response = test_client.get(
+        f"/automoveis/{automovel_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    response = test_client.get(
+        "/automoveis/?marca=Condicional", headers={"If-None-Match": list_etag}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_readiness_endpoint(test_client: TestClient):
+    """Testa o endpoint GET /health/ready com as estatísticas do pool."""
+    response = test_client.get("/health/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["database"] is True
+    assert body["pool"]["pool_class"]
+    assert body["pool"]["connections_opened"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets_endpoint(test_client: TestClient):
+    """Testa o parâmetro fields= na listagem e no detalhe de automóveis."""
+    automovel_id = test_client.post(
+        "/automoveis/",
+        json={
+            "marca": "Enxuta",
+            "modelo": "Fields",
+            "ano": 2020,
+            "cor": "Verde",
+            "tipo_combustivel": "Etanol",
+            "quilometragem": 300.0,
+            "numero_portas": 2,
+            "placa": "FLD1E20",
+            "chassi": "FIELDS00000000001",
+            "codigo_fipe": "001010-1",
+        },
+    ).json()["id"]
+
+    response = test_client.get(
+        "/automoveis/?marca=Enxuta&fields=id,marca,modelo,ano,placa"
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "id": automovel_id,
+            "marca": "Enxuta",
+            "modelo": "Fields",
+            "ano": 2020,
+            "placa": "FLD1E20",
+        }
+    ]
+
+    response = test_client.get(
+        f"/automoveis/{automovel_id}?fields=modelo,tipo_combustivel"
+    )
+    assert response.status_code == 200
+    assert response.json() == {"modelo": "Fields", "tipo_combustivel": "Etanol"}
+    assert "ETag" in response.headers
+
+    response = test_client.get("/automoveis/?fields=id,preco")
+    assert response.status_code == 400
+    assert "preco" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_patch_automoveis_endpoints(test_client: TestClient):
+    """Testa PATCH /automoveis/{id} e PATCH/DELETE /automoveis/ por filtro."""
+    base = {
+        "marca": "Remessa",
+        "modelo": "Strada",
+        "ano": 2019,
+        "cor": "Branco",
+        "tipo_combustivel": "Flex",
+        "quilometragem": 30000.0,
+        "numero_portas": 2,
+        "codigo_fipe": "001004-9",
+    }
+    ids = [
+        test_client.post(
+            "/automoveis/",
+            json={**base, "placa": None, "chassi": f"PATCH00000000000{i}"},
+        ).json()["id"]
+        for i in range(3)
+    ]
+
+    response = test_client.patch(
+        f"/automoveis/{ids[0]}", json={"quilometragem": 31000.0}
+    )
+    assert response.status_code == 200
+    assert response.json()["quilometragem"] == 31000.0
+    assert response.json()["cor"] == "Branco"
+    assert (
+        test_client.patch(f"/automoveis/{ids[0]}", json={"cor": None}).status_code
+        == 422
+    )
+    assert (
+        test_client.patch("/automoveis/99999", json={"cor": "Azul"}).status_code == 404
+    )
+
+    response = test_client.patch("/automoveis/?marca=Remessa", json={"cor": "Verde"})
+    assert response.json() == {"dry_run": True, "matched": 3, "affected": 0}
+    assert test_client.get(f"/automoveis/{ids[1]}").json()["cor"] == "Branco"
+
+    response = test_client.patch(
+        "/automoveis/?marca=Remessa&dry_run=false", json={"cor": "Verde"}
+    )
+    assert response.json() == {"dry_run": False, "matched": 3, "affected": 3}
+    assert test_client.get(f"/automoveis/{ids[1]}").json()["cor"] == "Verde"
+
+    response = test_client.patch(
+        "/automoveis/?marca=Remessa&dry_run=false", json={"placa": "ABC1D23"}
+    )
+    assert response.status_code == 400
+
+    # Sem filtros o lote seria o estoque inteiro: recusado, mesmo no dry-run.
+    response = test_client.patch("/automoveis/?dry_run=false", json={"cor": "Azul"})
+    assert response.status_code == 400
+    assert test_client.delete("/automoveis/?dry_run=false").status_code == 400
+    assert test_client.delete("/automoveis/").status_code == 400
+    # Filtros preenchidos que não geram condição também contam como "sem filtro".
+    for query in ("marca=", "q=!!!", "marca=&q=%20-"):
+        url = f"/automoveis/?{query}&dry_run=false"
+        assert test_client.patch(url, json={"cor": "Azul"}).status_code == 400
+        assert test_client.delete(url).status_code == 400
+    assert test_client.get(f"/automoveis/{ids[1]}").json()["cor"] == "Verde"
+
+    # quilometragem_max=0 é um filtro de verdade: só os automóveis com 0 km.
+    test_client.patch(f"/automoveis/{ids[0]}", json={"quilometragem": 0.0})
+    response = test_client.patch(
+        "/automoveis/?quilometragem_max=0&dry_run=false", json={"cor": "Zero"}
+    )
+    assert response.status_code == 200
+    zero_km = response.json()["affected"]
+    assert test_client.get(f"/automoveis/{ids[0]}").json()["cor"] == "Zero"
+    assert test_client.get(f"/automoveis/{ids[1]}").json()["cor"] == "Verde"
+    response = test_client.delete("/automoveis/?quilometragem_max=0")
+    assert response.json() == {"dry_run": True, "matched": zero_km, "affected": 0}
+
+    response = test_client.delete("/automoveis/?marca=Remessa&dry_run=false")
+    assert response.json()["affected"] == 3
+    assert test_client.get(f"/automoveis/{ids[2]}").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_inventory_version_endpoint(test_client: TestClient):
+    """Testa GET /automoveis/inventory-version: muda a cada escrita no estoque."""
+    before = test_client.get("/automoveis/inventory-version")
+    assert before.status_code == 200
+    created = test_client.post(
+        "/automoveis/",
+        json={
+            "marca": "Versao",
+            "modelo": "Estoque",
+            "ano": 2022,
+            "cor": "Preto",
+            "tipo_combustivel": "Elétrico",
+            "quilometragem": 0.0,
+            "numero_portas": 4,
+            "placa": None,
+            "chassi": "VERSAO00000000001",
+            "codigo_fipe": "001008-6",
+        },
+    ).json()
+    after_create = test_client.get("/automoveis/inventory-version").json()
+    assert after_create["total"] == before.json()["total"] + 1
+    assert after_create["version"] != before.json()["version"]
+
+    test_client.patch(f"/automoveis/{created['id']}", json={"cor": "Branco"})
+    after_update = test_client.get("/automoveis/inventory-version").json()
+    assert after_update["version"] != after_create["version"]
+
+    test_client.delete(f"/automoveis/{created['id']}")
+    after_delete = test_client.get("/automoveis/inventory-version").json()
+    assert after_delete["version"] not in (
+        after_create["version"],
+        after_update["version"],
+    )
@@ -0,0 +1,89 @@
+import asyncio
+import copy
+import logging
+import re
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.api.responses import TimedJSONResponse
+from app.core.config import settings
+from app.core.instrumentation import RequestTimings, current_timings
+
+
+def _server_timing(response) -> dict:
+    return {
+        name: (float(dur), desc)
+        for name, dur, desc in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response.headers["Server-Timing"]
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(test_client: TestClient):
+    response = test_client.get("/automoveis/?marca=ServerTiming&limit=5")
+    assert response.status_code == 200
+    timing = _server_timing(response)
+    assert set(timing) == {"db", "ser", "total"}
+    assert timing["db"][1] == "1 queries"
+    assert timing["total"][0] >= timing["db"][0]
+
+    assert "Server-Timing" in test_client.get("/").headers
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log(test_db_session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+            await test_db_session.execute(text("SELECT :valor"), {"valor": 42})
+    finally:
+        current_timings.reset(token)
+
+    assert timings.query_count == 1
+    assert any(
+        "Consulta lenta" in record.message and "42" in record.message
+        for record in caplog.records
+    )
+
+
+def test_serialization_timed_for_default_responses():
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+    try:
+        TimedJSONResponse({"total": 1, "marca": [{"value": "Fiat", "count": 1}]})
+    finally:
+        current_timings.reset(token)
+    assert timings.serialization_time > 0
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_leaves_no_timing_state(test_db_session):
+    connection = await test_db_session.connection()
+    # info da conexão DBAPI: sobrevive à devolução ao pool.
+    connection_info = (await connection.get_raw_connection()).info
+    info_before = copy.deepcopy(dict(connection_info))
+
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+    try:
+        with pytest.raises(Exception):
+            await test_db_session.execute(text("SELECT * FROM tabela_inexistente"))
+        await test_db_session.rollback()
+        await asyncio.sleep(0.05)  # um início de consulta perdido entraria na próxima
+
+        started = time.perf_counter()
+        await test_db_session.execute(text("SELECT 1"))
+        elapsed = time.perf_counter() - started
+    finally:
+        current_timings.reset(token)
+
+    # Só a consulta que terminou é contada, com a própria duração.
+    assert timings.query_count == 1
+    assert 0 < timings.db_time <= elapsed
+    assert copy.deepcopy(dict(connection_info)) == info_before
@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, MetricsRegistry, statement_type
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    calls = registry.register(Counter("calls_total", "Chamadas.", ("route",)))
+    latency = registry.register(
+        Histogram("latency_seconds", "Latência.", ("route",), buckets=(0.1, 1.0))
+    )
+    calls.inc(route='/a"b')
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+
+    text = registry.render()
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{route="/a\\"b"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_statement_type():
+    assert statement_type("  select 1") == "SELECT"
+    assert statement_type("WITH filtrados AS (...) SELECT 1") == "WITH"
+    assert statement_type("SAVEPOINT sa_1") == "OTHER"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(test_client: TestClient):
+    test_client.get("/automoveis/?marca=Metricas")
+    test_client.get("/automoveis/999999")
+
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/automoveis/",status="200"}' in body
+    assert (
+        'http_requests_total{method="GET",route="/automoveis/{automovel_id}",status="404"}'
+        in body
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/automoveis/"}' in body
+    )
+    assert 'http_response_size_bytes_bucket{method="GET",route="/automoveis/"' in body
+    assert "http_requests_in_flight 1" in body
+    assert 'db_queries_total{statement="SELECT"}' in body
+    assert 'query_cache_events_total{event="hits"}' in body
+    assert "# TYPE mcp_tool_calls_total counter" in body
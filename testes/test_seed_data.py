@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.repository.models.automovel import Automovel
+from app.scripts.seed_data import chassi_for, seed_automoveis
+
+
+@pytest.mark.asyncio
+async def test_seed_continues_after_the_highest_chassi():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        await seed_automoveis(engine, 100)
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(Automovel).where(Automovel.chassi == chassi_for(0))
+            )
+
+        # Com a contagem (99) como início, o 9BS00000000000099 seria repetido.
+        await seed_automoveis(engine, 10)
+
+        async with engine.connect() as conn:
+            total, highest = (
+                await conn.execute(select(func.count(), func.max(Automovel.chassi)))
+            ).one()
+        assert total == 109
+        assert highest == chassi_for(109)
+    finally:
+        await engine.dispose()